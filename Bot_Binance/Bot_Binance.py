@@ -25,19 +25,66 @@ import asyncio
 import logging
 import yaml
 import random
+from dataclasses import MISSING, dataclass, fields
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from decimal import Decimal, ROUND_DOWN
 from signal_bot.signal_scanner import SignalScanner
 # Rest of imports
-from binance.client import Client
 from signal_bot.signal_bot import SignalBot
 from trade_manager.trade_manager import TradeManager
 from shared.telegram_handler import TelegramHandler
 from trade_manager.gui_manager import GUIManager
 from shared.websocket_server import WebSocketServer
+from shared.log_utils import start_queue_logging
 from shared.mock_binance import MockBinanceClient
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@dataclass(frozen=True)
+class BotConfig:
+    """Bot configuration, loaded once from config.yaml"""
+    
+    # Required
+    min_volume: float
+    min_confidence: float
+    timeframes: Tuple[str, ...]
+    order_size: float
+    max_orders: int
+    risk_per_trade: float
+    
+    # Optional
+    test_mode: bool = True
+    gui_enabled: bool = True
+    ws_enabled: bool = False
+    api_key: str = ''
+    api_secret: str = ''
+    telegram_token: str = ''
+    telegram_chat_id: str = ''
+    gui_update_interval: float = 1
+    ws_host: str = 'localhost'
+    ws_port: int = 8765
+
+    @classmethod
+    def from_dict(cls, data: Dict, logger: logging.Logger) -> Optional['BotConfig']:
+        """Build a config from parsed YAML, or None if a required field is missing"""
+        known = {f.name for f in fields(cls)}
+        for key in data:
+            if key not in known:
+                logger.warning(f"Unknown config field ignored: {key}")
+                
+        for f in fields(cls):
+            if f.default is MISSING and f.name not in data:
+                logger.error(f"Missing required config field: {f.name}")
+                return None
+                
+        values = {k: v for k, v in data.items() if k in known}
+        values['timeframes'] = tuple(values['timeframes'])
+        return cls(**values)
 
 class MockMarketData:
     """Simulates market data without real API"""
@@ -141,9 +188,11 @@ class BotManager:
     
     def __init__(self):
         """Initialize Bot Manager"""
-        self.config: Dict = {}
+        self.config: Optional[BotConfig] = None
+        self._log_listener = None
         self.logger = self._setup_logging()
         self.client = MockBinanceClient()
+        self.market_data = self.client.market_data
         self.pair_manager = PairManager()
         self.telegram = None
         self.signal_bot = None
@@ -151,16 +200,17 @@ class BotManager:
         self.gui_manager = None
         self._is_running = False
         self.start_time = datetime.utcnow()
+        
+        # Simulated price updates pushed to the trade manager
+        self.price_update_interval = 1.0  # seconds
+        self.last_price_update = datetime.min
 
 
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
         try:
             # Create logs directory
-            logs_dir = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                'logs'
-            )
+            logs_dir = os.path.join(current_dir, 'logs')
             os.makedirs(logs_dir, exist_ok=True)
 
             # Create log filename with current date
@@ -192,9 +242,9 @@ class BotManager:
             # Clear existing handlers
             logger.handlers.clear()
 
-            # Add handlers
-            logger.addHandler(fh)
-            logger.addHandler(ch)
+            # Write to file and console from a background thread so
+            # logging never blocks the event loop
+            self._log_listener = start_queue_logging(logger, [fh, ch])
 
             return logger
 
@@ -202,40 +252,38 @@ class BotManager:
             print(f"Error setting up logging: {str(e)}")
             return logging.getLogger('BotManager')
 
-    def _load_config(self) -> bool:
+    @staticmethod
+    def _read_config(config_path: str) -> Dict:
+        """Read and parse the YAML config file"""
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+
+    async def _load_config(self) -> bool:
         """Load configuration from YAML file"""
         try:
-            config_path = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                'config.yaml'
-            )
+            config_path = os.path.join(current_dir, 'config.yaml')
             
             if not os.path.exists(config_path):
                 self.logger.error(f"Config file not found: {config_path}")
                 return False
 
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f)
+            # File read and YAML parsing run off the event loop
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, self._read_config, config_path)
 
             # Validate configuration
-            required_fields = [
-                'min_volume', 'min_confidence', 'timeframes',
-                'order_size', 'max_orders', 'risk_per_trade'
-            ]
-            
-            for field in required_fields:
-                if field not in self.config:
-                    self.logger.error(f"Missing required config field: {field}")
-                    return False
+            self.config = BotConfig.from_dict(data, self.logger)
+            if not self.config:
+                return False
 
             # Log configuration
             self.logger.info("Configuration loaded:")
-            self.logger.info(f"- Min Volume: ${self.config['min_volume']:,}")
-            self.logger.info(f"- Min Confidence: {self.config['min_confidence']}%")
-            self.logger.info(f"- Timeframes: {', '.join(self.config['timeframes'])}")
-            self.logger.info(f"- Order Size: ${self.config['order_size']:,}")
-            self.logger.info(f"- Max Orders: {self.config['max_orders']}")
-            self.logger.info(f"- Risk Per Trade: {self.config['risk_per_trade']}%")
+            self.logger.info(f"- Min Volume: ${self.config.min_volume:,}")
+            self.logger.info(f"- Min Confidence: {self.config.min_confidence}%")
+            self.logger.info(f"- Timeframes: {', '.join(self.config.timeframes)}")
+            self.logger.info(f"- Order Size: ${self.config.order_size:,}")
+            self.logger.info(f"- Max Orders: {self.config.max_orders}")
+            self.logger.info(f"- Risk Per Trade: {self.config.risk_per_trade}%")
 
             return True
 
@@ -248,12 +296,16 @@ class BotManager:
         while self._is_running:
             try:
                 now = datetime.utcnow()
-                if (now - self.last_price_update).total_seconds() >= self.price_update_interval:
+                elapsed = (now - self.last_price_update).total_seconds()
+                if elapsed >= self.price_update_interval:
                     prices = self.market_data.get_all_prices()
                     if self.trade_manager:
                         await self.trade_manager.update_prices(prices)
                     self.last_price_update = now
-                await asyncio.sleep(0.1)  # Small delay to prevent CPU overload
+                    elapsed = 0
+                    
+                # Sleep until the next update is due instead of polling
+                await asyncio.sleep(self.price_update_interval - elapsed)
             except Exception as e:
                 self.logger.error(f"Error updating market data: {str(e)}")
                 await asyncio.sleep(1)
@@ -264,7 +316,7 @@ class BotManager:
             self.start_time = datetime.utcnow()
             
             # Load configuration
-            if not self._load_config():
+            if not await self._load_config():
                 return False
 
             # Test mock connection
@@ -309,7 +361,7 @@ class BotManager:
 
 
                 # Initialize GUI if enabled
-                if self.config.get('gui_enabled', True):
+                if self.config.gui_enabled:
                     self.gui_manager = GUIManager(self.trade_manager)
                     self.gui_manager.start()
                     self.logger.info("GUI started successfully")
@@ -395,6 +447,12 @@ class BotManager:
                 
         except Exception as e:
             self.logger.error(f"Error stopping manager: {str(e)}")
+            
+        finally:
+            # Flush queued records and stop the logging thread
+            if self._log_listener:
+                self._log_listener.stop()
+                self._log_listener = None
 
 def run_app():
     """Application entry point"""
@@ -406,10 +464,18 @@ def run_app():
         print(f"User: {os.getenv('USER', 'Anhbaza01')}")
         print("="*50 + "\n")
 
+        # Use the libuv-backed loop where available (POSIX only)
+        if os.name != 'nt' and uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            
         # Create and configure event loop
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         
+        # Run tasks eagerly until their first await (Python 3.12+)
+        if hasattr(asyncio, 'eager_task_factory'):
+            loop.set_task_factory(asyncio.eager_task_factory)
+        
         # Create and run bot manager
         manager = BotManager()
         
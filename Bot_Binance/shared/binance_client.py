@@ -0,0 +1,42 @@
+"""
+Pooled Binance Async Client
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+import aiohttp
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+from .websocket_client import loads_message
+
+class PooledAsyncClient(AsyncClient):
+    """AsyncClient whose REST calls share one keep-alive connection pool"""
+    
+    # Connection pool settings
+    CONNECTOR_LIMIT = 50
+    DNS_CACHE_TTL = 300
+    KEEPALIVE_TIMEOUT = 75
+
+    def _init_session(self) -> aiohttp.ClientSession:
+        """Create the session on a pooled connector instead of the default one"""
+        connector = aiohttp.TCPConnector(
+            limit=self.CONNECTOR_LIMIT,
+            ttl_dns_cache=self.DNS_CACHE_TTL,
+            keepalive_timeout=self.KEEPALIVE_TIMEOUT
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self._get_headers()
+        )
+
+    async def _handle_response(self, response: aiohttp.ClientResponse):
+        """Decode response bodies with orjson when it is installed"""
+        if not str(response.status).startswith('2'):
+            raise BinanceAPIException(response, response.status, await response.text())
+        try:
+            return await response.json(loads=loads_message)
+        except ValueError:
+            txt = await response.text()
+            raise BinanceRequestException(f'Invalid Response: {txt}')
@@ -8,9 +8,17 @@ Last Updated: 2025-05-24 10:03:02 UTC
 from enum import Enum
 
 class Config:
+    # Quote asset of the pairs scanned
+    QUOTE_ASSET = "USDT"
+    
     # Minimum 24h USDT volume for trading pairs
     MIN_VOLUME = 1_000_000  # $1M USD
     
+    # Pairs the scanner fetches and analyzes at the same time, plus
+    # temporary extra scans allowed while every slot is taken
+    SCAN_CONCURRENCY = 20
+    SCAN_BURST = 5
+    
     # Technical indicators
     RSI_PERIOD = 14
     FAST_MA = 12
@@ -74,6 +82,7 @@ class MessageType(Enum):
     """WebSocket message types"""
     REGISTER = "REGISTER"
     SIGNAL = "SIGNAL"
+    SIGNAL_BATCH = "SIGNAL_BATCH"
     ORDER = "ORDER"
     ORDER_UPDATE = "ORDER_UPDATE"
     ERROR = "ERROR"
@@ -225,6 +234,15 @@ class DatabaseConfig:
     BACKUP_DIR = "database/backups"
     BACKUP_INTERVAL = 86400  # 24 hours
     
+    # Signal bot klines cache, saved every CACHE_SAVE_CYCLES scans and on stop
+    SIGNAL_CACHE_PATH = "database/signal_cache.npz"
+    SIGNAL_STATE_PATH = "database/signal_state.json"
+    CACHE_SAVE_CYCLES = 10
+    
+    # Scanner pair list, reused on startup while younger than the TTL
+    PAIRS_CACHE_PATH = "database/pairs_cache.json"
+    PAIRS_CACHE_TTL = 86400  # 24 hours
+    
     # Tables
     TRADES_TABLE = "trades"
     SIGNALS_TABLE = "signals"
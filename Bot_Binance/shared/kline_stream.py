@@ -0,0 +1,102 @@
+"""
+Binance Kline Stream
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+import asyncio
+import logging
+import websockets
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .websocket_client import loads_message
+
+# (open time, open, high, low, close, volume)
+KlineRow = Tuple[int, float, float, float, float, float]
+
+class KlineStream:
+    """Keep candles current from Binance multiplexed kline streams"""
+
+    BASE_URL = "wss://stream.binance.com:9443/stream?streams="
+
+    # Binance allows up to 1024 streams per connection; smaller groups
+    # keep the URL short and limit what one dropped socket affects
+    STREAMS_PER_CONNECTION = 200
+    RECONNECT_DELAY = 5
+
+    def __init__(
+        self,
+        on_kline: Callable[[str, str, KlineRow], None],
+        logger: Optional[logging.Logger] = None
+    ):
+        self.on_kline = on_kline
+        self.logger = logger or logging.getLogger(__name__)
+        self._tasks: List[asyncio.Task] = []
+        self._group_of: Dict[Tuple[str, str], int] = {}
+        self._connected: Set[int] = set()
+
+    def start(self, symbols: Sequence[str], intervals: Sequence[str]):
+        """Subscribe to every symbol/interval pair"""
+        streams = [
+            (symbol, interval)
+            for symbol in symbols
+            for interval in intervals
+        ]
+        size = self.STREAMS_PER_CONNECTION
+        for group, first in enumerate(range(0, len(streams), size)):
+            names = []
+            for symbol, interval in streams[first:first + size]:
+                self._group_of[symbol, interval] = group
+                names.append(f"{symbol.lower()}@kline_{interval}")
+            self._tasks.append(asyncio.create_task(self._listen(group, names)))
+
+        self.logger.info(
+            f"Kline stream started: {len(streams)} streams "
+            f"on {len(self._tasks)} connections"
+        )
+
+    async def stop(self):
+        """Close all stream connections"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._group_of = {}
+        self._connected.clear()
+
+    def is_live(self, symbol: str, interval: str) -> bool:
+        """Check whether pushes for a pair are currently being received"""
+        return self._group_of.get((symbol, interval)) in self._connected
+
+    async def _listen(self, group: int, streams: List[str]):
+        """Receive pushes for one group of streams, reconnecting on errors"""
+        uri = self.BASE_URL + '/'.join(streams)
+        while True:
+            try:
+                async with websockets.connect(uri) as websocket:
+                    self._connected.add(group)
+                    async for message in websocket:
+                        self._handle_message(message)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Kline stream error: {str(e)}")
+            finally:
+                self._connected.discard(group)
+
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def _handle_message(self, message: str):
+        """Forward one kline push to the callback"""
+        try:
+            k = loads_message(message)['data']['k']
+            self.on_kline(
+                k['s'],
+                k['i'],
+                (int(k['t']), float(k['o']), float(k['h']),
+                 float(k['l']), float(k['c']), float(k['v']))
+            )
+        except Exception as e:
+            self.logger.error(f"Error handling kline message: {str(e)}")
@@ -0,0 +1,28 @@
+"""
+Logging Utilities
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+import queue
+import logging
+import logging.handlers
+from typing import List
+
+
+def start_queue_logging(
+    logger: logging.Logger,
+    handlers: List[logging.Handler]
+) -> logging.handlers.QueueListener:
+    """Attach a QueueHandler to logger and drain it to handlers on a background thread"""
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        *handlers,
+        respect_handler_level=True
+    )
+    listener.start()
+    return listener
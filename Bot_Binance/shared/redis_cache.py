@@ -0,0 +1,129 @@
+"""
+Redis Response Cache
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+import os
+import gzip
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from .websocket_client import dumps_message, loads_message
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+class RedisCache:
+    """TTL cache in Redis shared by sibling processes and restarts
+
+    Values are stored as gzipped JSON. Without the redis package or a
+    REDIS_URL the wrapped fetch simply runs every time.
+    """
+
+    KEY_PREFIX = "bot_binance:"
+
+    # One process refreshes an expired key while the others wait up to
+    # the lease for its value, then fetch themselves
+    LEASE_SECONDS = 10
+    POLL_INTERVAL = 0.1
+
+    # Drops the lease only while it still holds this process's token, so
+    # a fetch that outlived its lease never frees another process's one
+    RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+    # Multi-MB payloads are compressed on the event loop; level 1 keeps
+    # that cheap at a small cost in size
+    COMPRESS_LEVEL = 1
+
+    def __init__(self, url: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        self.url = url or os.getenv('REDIS_URL')
+        self.logger = logger or logging.getLogger(__name__)
+        self._redis = None
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether values are shared through Redis"""
+        return aioredis is not None and bool(self.url)
+
+    async def get_or_set(self, key: str, ttl: int, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, else fetch and store it for ttl seconds"""
+        if not self.enabled:
+            return await fetch()
+
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.url)
+        name = self.KEY_PREFIX + key
+        lease = f"{name}:lease"
+        token = uuid.uuid4().hex
+        held = False
+
+        try:
+            value = await self._read(name)
+            if value is not None:
+                return value
+
+            # Only the lease holder refreshes; the rest wait for its value
+            held = bool(await self._redis.set(lease, token, nx=True, ex=self.LEASE_SECONDS))
+            if not held:
+                for _ in range(int(self.LEASE_SECONDS / self.POLL_INTERVAL)):
+                    await asyncio.sleep(self.POLL_INTERVAL)
+                    value = await self._read(name)
+                    if value is not None:
+                        return value
+
+        except Exception as e:
+            self.logger.error(f"Redis cache error: {str(e)}")
+            return await fetch()
+
+        try:
+            value = await fetch()
+            await self._write(name, value, ttl)
+            return value
+        finally:
+            # Also when fetch() raised, so waiters need not sit out the lease
+            if held:
+                await self._release(lease, token)
+
+    async def _write(self, name: str, value: Any, ttl: int):
+        """Store a value for ttl seconds"""
+        try:
+            data = dumps_message(value)
+            if isinstance(data, str):
+                data = data.encode()
+            data = gzip.compress(data, compresslevel=self.COMPRESS_LEVEL)
+            await self._redis.set(name, data, ex=ttl)
+        except Exception as e:
+            self.logger.error(f"Redis cache error: {str(e)}")
+
+    async def _release(self, lease: str, token: str):
+        """Delete the lease if this process still holds it"""
+        try:
+            await self._redis.eval(self.RELEASE_SCRIPT, 1, lease, token)
+        except Exception as e:
+            self.logger.error(f"Redis cache error: {str(e)}")
+
+    async def _read(self, name: str) -> Any:
+        """Decode a stored value, None when the key is missing"""
+        data = await self._redis.get(name)
+        if data is None:
+            return None
+        return loads_message(gzip.decompress(data))
+
+    async def close(self):
+        """Close the Redis connection; the next call reconnects"""
+        if self._redis is not None:
+            # redis-py 5 renamed close() to aclose()
+            close = getattr(self._redis, 'aclose', None) or self._redis.close
+            await close()
+            self._redis = None
@@ -6,12 +6,60 @@ Last Updated: 2025-05-24 08:17:42 UTC
 """
 
 import json
+import socket
 import asyncio
 import logging
 import websockets
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, Union
 from datetime import datetime
 
+from .constants import MessageType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Naive datetimes are UTC throughout the bots
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    )
+
+def _json_default(obj):
+    """Encode the types orjson handles natively, for the json fallback"""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None or not obj.utcoffset():
+            return obj.replace(tzinfo=None).isoformat() + 'Z'
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):
+        # numpy scalars and arrays
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_message(message: Dict) -> Union[bytes, str]:
+    """Serialize a message, as UTF-8 bytes when orjson is available
+    
+    datetime values are written as ISO 8601 UTC strings ending in Z.
+    """
+    if orjson is not None:
+        return orjson.dumps(message, option=_ORJSON_OPTIONS)
+    return json.dumps(message, default=_json_default)
+
+# Parse incoming frames with orjson when available; it accepts str or bytes
+# and raises a json.JSONDecodeError subclass on invalid input
+loads_message = orjson.loads if orjson is not None else json.loads
+
+_SIGNAL = MessageType.SIGNAL.value
+_SIGNAL_BATCH = MessageType.SIGNAL_BATCH.value
+
+def set_nodelay(websocket) -> None:
+    """Disable Nagle's algorithm so small frames are sent immediately"""
+    transport = getattr(websocket, 'transport', None)
+    sock = transport.get_extra_info('socket') if transport else None
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
 class WebSocketClient:
     def __init__(
         self,
@@ -50,6 +98,7 @@ class WebSocketClient:
                 websockets.connect(uri),
                 timeout=10
             )
+            set_nodelay(self.websocket)
             
             self._connected = True
             self._retry_count = 0
@@ -103,12 +152,13 @@ class WebSocketClient:
                 return False
                 
             # Convert to JSON
-            json_message = json.dumps(message)
+            json_message = dumps_message(message)
             
             # Send message
             await self.websocket.send(json_message)
             
-            self.logger.debug(f"Sent: {json_message}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Sent: %s", json_message)
             return True
             
         except Exception as e:
@@ -120,12 +170,18 @@ class WebSocketClient:
         """Handle incoming message"""
         try:
             # Parse JSON message
-            data = json.loads(message)
+            data = loads_message(message)
             message_type = data.get('type')
             
-            if message_type in self.handlers:
+            handler = self.handlers.get(message_type)
+            if handler is not None:
                 # Call registered handler
-                await self.handlers[message_type](data.get('data', {}))
+                await handler(data.get('data', {}))
+            elif message_type == _SIGNAL_BATCH and _SIGNAL in self.handlers:
+                # Unpack batched signals for the single-signal handler
+                handler = self.handlers[_SIGNAL]
+                for signal in data.get('data', []):
+                    await handler(signal)
             else:
                 self.logger.warning(f"No handler for message type: {message_type}")
                 
@@ -11,11 +11,22 @@ import json
 import asyncio
 import logging
 from datetime import datetime
-from typing import Set, Dict, Optional
+from typing import Set, Dict, Optional, Union
 import websockets
 from websockets.server import WebSocketServerProtocol
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from .constants import MessageType, ClientType
+from .log_utils import start_queue_logging
+from .websocket_client import dumps_message, loads_message, set_nodelay
+
+_REGISTER = MessageType.REGISTER.value
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 class WebSocketServer:
     def __init__(
@@ -26,6 +37,7 @@ class WebSocketServer:
     ):
         self.host = host
         self.port = port
+        self._log_listener = None
         self.logger = logger or self._setup_logging()
         
         # Client connections
@@ -35,6 +47,11 @@ class WebSocketServer:
         self.signal_bot = None  # Signal Bot connection
         self.trade_bot = None   # Trade Manager connection
         
+        # Per-connection message queue size, and how long a closing
+        # connection may take to handle what is already queued
+        self.queue_size = 256
+        self.drain_timeout = 5
+        
         # Server status
         self._running = False
 
@@ -42,8 +59,7 @@ class WebSocketServer:
         """Setup logging"""
         try:
             # Create logs directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            logs_dir = os.path.join(current_dir, '../logs')
+            logs_dir = os.path.join(_MODULE_DIR, '../logs')
             os.makedirs(logs_dir, exist_ok=True)
             
             # Log filename with timestamp
@@ -52,16 +68,23 @@ class WebSocketServer:
                 f'websocket_server_{datetime.utcnow().strftime("%Y%m%d")}.log'
             )
             
-            # Configure logging
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s UTC | %(levelname)s | %(message)s',
-                handlers=[
-                    logging.FileHandler(log_filename),
-                    logging.StreamHandler(sys.stdout)
-                ],
-                datefmt='%Y-%m-%d %H:%M:%S'
+            # Configure handlers
+            formatter = logging.Formatter(
+                '%(asctime)s UTC | %(levelname)s | %(message)s',
+                '%Y-%m-%d %H:%M:%S'
             )
+            handlers = [
+                logging.FileHandler(log_filename),
+                logging.StreamHandler(sys.stdout)
+            ]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            
+            # Write log records from a background thread so file I/O
+            # never blocks the event loop
+            root = logging.getLogger()
+            root.setLevel(logging.INFO)
+            self._log_listener = start_queue_logging(root, handlers)
             
             logger = logging.getLogger("WebSocketServer")
             
@@ -104,11 +127,11 @@ class WebSocketServer:
                 'data': {
                     'signal_bot': self.signal_bot is not None,
                     'trade_bot': self.trade_bot is not None,
-                    'time': datetime.utcnow().isoformat()
+                    'time': datetime.utcnow()
                 }
             }
             
-            await self.broadcast(json.dumps(status))
+            await self.broadcast(dumps_message(status))
             
         except Exception as e:
             self.logger.error(f"[-] Error registering client: {str(e)}")
@@ -137,16 +160,16 @@ class WebSocketServer:
                 'data': {
                     'signal_bot': self.signal_bot is not None,
                     'trade_bot': self.trade_bot is not None,
-                    'time': datetime.utcnow().isoformat()
+                    'time': datetime.utcnow()
                 }
             }
             
-            await self.broadcast(json.dumps(status))
+            await self.broadcast(dumps_message(status))
             
         except Exception as e:
             self.logger.error(f"[-] Error unregistering client: {str(e)}")
 
-    async def broadcast(self, message: str):
+    async def broadcast(self, message: Union[bytes, str]):
         """Broadcast message to all clients"""
         if not self.clients:
             return
@@ -175,16 +198,18 @@ class WebSocketServer:
         """Handle incoming message"""
         try:
             # Parse JSON message
-            data = json.loads(message)
+            data = loads_message(message)
             message_type = data.get('type')
             
             # Log message
-            self.logger.info(
-                f"[*] Received {message_type} from "
-                f"{'Signal Bot' if websocket == self.signal_bot else 'Trade Bot'}"
-            )
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "[*] Received %s from %s",
+                    message_type,
+                    'Signal Bot' if websocket == self.signal_bot else 'Trade Bot'
+                )
             
-            if message_type == MessageType.REGISTER.value:
+            if message_type == _REGISTER:
                 # Register new client
                 await self.register_client(
                     websocket,
@@ -204,20 +229,52 @@ class WebSocketServer:
         except Exception as e:
             self.logger.error(f"[-] Error handling message: {str(e)}")
 
+    async def _drain(
+        self,
+        queue: asyncio.Queue,
+        websocket: WebSocketServerProtocol
+    ):
+        """Process queued messages for a single connection"""
+        while True:
+            message = await queue.get()
+            try:
+                await self.handle_message(websocket, message)
+            finally:
+                queue.task_done()
+
     async def handler(self, websocket: WebSocketServerProtocol):
         """Handle new WebSocket connection"""
+        # Receiving and handling run as separate tasks so recv can keep
+        # pulling frames while the previous message is being forwarded
+        set_nodelay(websocket)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        worker = asyncio.create_task(self._drain(queue, websocket))
+        client_info = f"{websocket.remote_address}"
+        
         try:
             # Log client info
-            client_info = f"{websocket.remote_address}"
             self.logger.info(f"[+] New connection from {client_info}")
             
-            # Handle messages
+            # Queue messages
             async for message in websocket:
-                await self.handle_message(websocket, message)
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # Backpressure: wait for the worker to catch up
+                    await queue.put(message)
                 
         except websockets.exceptions.ConnectionClosed:
             self.logger.info(f"[-] Connection closed: {client_info}")
         finally:
+            # Finish handling what is already queued, however the
+            # connection ended
+            try:
+                await asyncio.wait_for(queue.join(), timeout=self.drain_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"[-] Dropped {queue.qsize()} queued messages from {client_info}"
+                )
+            worker.cancel()
             await self.unregister_client(websocket)
 
     async def start(self):
@@ -260,6 +317,10 @@ class WebSocketServer:
             await asyncio.wait(tasks)
             
         self.logger.info("[+] WebSocket server stopped")
+        
+        if self._log_listener:
+            self._log_listener.stop()
+            self._log_listener = None
 
 def main():
     """Main function"""
@@ -272,11 +333,18 @@ def main():
             asyncio.set_event_loop_policy(
                 asyncio.WindowsSelectorEventLoopPolicy()
             )
+        elif uvloop is not None:
+            # libuv-backed loop, POSIX only
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
             
         # Create event loop
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         
+        # Run tasks eagerly until their first await (Python 3.12+)
+        if hasattr(asyncio, 'eager_task_factory'):
+            loop.set_task_factory(asyncio.eager_task_factory)
+        
         # Run server
         loop.run_until_complete(server.start())
         
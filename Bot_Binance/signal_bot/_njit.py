@@ -0,0 +1,18 @@
+"""
+Numba JIT Helpers
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run the plain Python function"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -7,16 +7,199 @@ Last Updated: 2025-05-24 10:08:36 UTC
 
 import os
 import sys
+import time
 import logging
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Tuple, Union
 
 # Add project root to path for imports
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, PROJECT_ROOT)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 from shared.constants import Config, SignalType
+from signal_bot._njit import njit
+
+# Leading kline columns the analysis reads:
+# (open time, open, high, low, close, volume)
+KLINE_COLUMNS = 6
+
+# Hot-path constants, resolved once instead of per comparison
+_LONG = SignalType.LONG.value
+_SHORT = SignalType.SHORT.value
+_MIN_CONFIDENCE = Config.MIN_CONFIDENCE
+_VOLUME_RATIO_MIN = Config.VOLUME_RATIO_MIN
+_FAST_MA = Config.FAST_MA
+_SLOW_MA = Config.SLOW_MA
+_VOLUME_PERIOD = Config.VOLUME_PERIOD
+_RSI_PERIOD = 14
+_MACD_SIGNAL = 9
+
+# Fewest candles the analysis needs: slow MA plus the 9-period MACD signal
+MIN_KLINES = max(Config.SLOW_MA + _MACD_SIGNAL - 1, Config.VOLUME_PERIOD + 1)
+
+# Field names of klines_to_array, in Binance kline column order
+KLINE_FIELDS = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
+def parse_klines(klines: Union[List[List], np.ndarray]) -> np.ndarray:
+    """Parse klines into a (candles, KLINE_COLUMNS) float64 array
+    
+    Only the leading OHLCV fields of each REST row are converted; the
+    close time, trade count and taker volumes after them are never read.
+    """
+    if isinstance(klines, np.ndarray):
+        return np.asarray(klines, dtype=np.float64)[:, :KLINE_COLUMNS]
+    return np.array(
+        [row[:KLINE_COLUMNS] for row in klines], dtype=np.float64
+    ).reshape(-1, KLINE_COLUMNS)
+
+def klines_to_array(klines: Union[List[List], np.ndarray]) -> Dict[str, np.ndarray]:
+    """Convert klines to one contiguous float64 array per field
+    
+    Accepts Binance REST klines or a numeric array in the same column
+    order; the strings are parsed once here instead of by every reader.
+    """
+    data = parse_klines(klines)
+    return dict(zip(KLINE_FIELDS, np.ascontiguousarray(data.T)))
+
+@dataclass(frozen=True)
+class Signal:
+    """Trading signal, validated once at construction"""
+    __slots__ = (
+        'symbol', 'type', 'entry_price', 'take_profit', 'stop_loss',
+        'confidence', 'rsi', 'volume_ratio', 'time'
+    )
+    
+    symbol: str
+    type: str
+    entry_price: float
+    take_profit: float
+    stop_loss: float
+    confidence: float
+    rsi: float
+    volume_ratio: float
+    time: int
+
+    def __post_init__(self):
+        if self.type not in (_LONG, _SHORT):
+            raise ValueError(f"Invalid signal type: {self.type}")
+            
+        if self.confidence < _MIN_CONFIDENCE:
+            raise ValueError(f"Confidence too low: {self.confidence}")
+            
+        if self.entry_price <= 0:
+            raise ValueError(f"Invalid entry price: {self.entry_price}")
+            
+        # Validate risk/reward
+        if self.type == _LONG:
+            risk = self.entry_price - self.stop_loss
+            reward = self.take_profit - self.entry_price
+        else:
+            risk = self.stop_loss - self.entry_price
+            reward = self.entry_price - self.take_profit
+            
+        if risk <= 0 or reward <= 0:
+            raise ValueError("Invalid risk/reward levels")
+            
+        # Risk:Reward should be at least 1:2 (allow for price rounding)
+        if reward / risk < 2 - 1e-6:
+            raise ValueError(f"Risk/reward below 1:2: {reward / risk:.2f}")
+
+    def to_dict(self) -> Dict:
+        """Convert signal to dictionary"""
+        return asdict(self)
+
+@njit(cache=True)
+def _wilder_kernel(closes: np.ndarray, period: int, out: np.ndarray):
+    """Wilder-smoothed RSI over closes into out"""
+    n = len(closes)
+    up = 0.
+    down = 0.
+    # Seed from the first period+1 price changes
+    for i in range(1, min(period + 2, n)):
+        delta = closes[i] - closes[i-1]
+        if delta >= 0:
+            up += delta
+        else:
+            down -= delta
+    up /= period
+    down /= period
+
+    seed_rsi = 100. - 100./(1. + up/down) if down != 0 else 100.
+    for i in range(min(period, n)):
+        out[i] = seed_rsi
+
+    for i in range(period, n):
+        delta = closes[i] - closes[i-1]
+        up = (up*(period-1) + max(delta, 0.))/period
+        down = (down*(period-1) + max(-delta, 0.))/period
+        out[i] = 100. - 100./(1. + up/down) if down != 0 else 100.
+
+@njit(cache=True)
+def _sma_kernel(data: np.ndarray, period: int, out: np.ndarray):
+    """Rolling-sum SMA over data into out, one value per full window"""
+    total = 0.
+    for i in range(period):
+        total += data[i]
+    out[0] = total / period
+    for i in range(period, len(data)):
+        total += data[i] - data[i-period]
+        out[i-period+1] = total / period
+
+@dataclass
+class IndicatorState:
+    """Running indicators for one symbol and interval
+    
+    Values are as of the last closed candle. update() folds in the next
+    closed candle in O(1); volume_ratio() and moving_averages() step onto
+    the candle still forming without storing it. RSI is not kept: Wilder
+    smoothing depends on where the window starts, so a carried value
+    drifts from the one a fresh window gives.
+    """
+    time: float       # Open time of the last closed candle
+    volume_sum: float
+    fast_sum: float   # Sum of the last FAST_MA-1 closed closes
+    slow_sum: float   # Sum of the last SLOW_MA-1 closed closes
+    volumes: deque = field(
+        default_factory=lambda: deque(maxlen=_VOLUME_PERIOD - 1)
+    )  # Last VOLUME_PERIOD-1 closed volumes
+    closes: deque = field(
+        default_factory=lambda: deque(maxlen=_SLOW_MA - 1)
+    )  # Last SLOW_MA-1 closed closes
+    fast_ma: deque = field(
+        default_factory=lambda: deque(maxlen=_MACD_SIGNAL - 1)
+    )  # Fast MA of the last MACD_SIGNAL-1 closed candles
+    slow_ma: deque = field(
+        default_factory=lambda: deque(maxlen=_MACD_SIGNAL - 1)
+    )  # Slow MA of the last MACD_SIGNAL-1 closed candles
+    
+    def update(self, time: float, close: float, volume: float):
+        """Advance by one closed candle"""
+        self.volume_sum += volume - self.volumes[0]
+        self.volumes.append(volume)
+        self.fast_ma.append((self.fast_sum + close) / _FAST_MA)
+        self.slow_ma.append((self.slow_sum + close) / _SLOW_MA)
+        self.fast_sum += close - self.closes[1 - _FAST_MA]
+        self.slow_sum += close - self.closes[0]
+        self.closes.append(close)
+        self.time = time
+        
+    def volume_ratio(self, volume: float) -> float:
+        """Forming candle's volume relative to the VOLUME_PERIOD average"""
+        volume_ma = (self.volume_sum + volume) / _VOLUME_PERIOD
+        return volume / volume_ma if volume_ma > 0 else 0
+        
+    def moving_averages(self, close: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Last MACD_SIGNAL fast and slow MA values, up to the forming candle"""
+        fast_ma = np.empty(_MACD_SIGNAL)
+        slow_ma = np.empty(_MACD_SIGNAL)
+        fast_ma[:-1] = self.fast_ma
+        slow_ma[:-1] = self.slow_ma
+        fast_ma[-1] = (self.fast_sum + close) / _FAST_MA
+        slow_ma[-1] = (self.slow_sum + close) / _SLOW_MA
+        return fast_ma, slow_ma
 
 class SignalAnalyzer:
     def __init__(
@@ -24,289 +207,266 @@ class SignalAnalyzer:
         logger: Optional[logging.Logger] = None
     ):
         self.logger = logger or logging.getLogger(__name__)
+        
+        # Incremental MA and volume state per (symbol, interval), least
+        # recently used first; evicted pairs are reseeded on their next use
+        self.max_states = 10000
+        self._state: OrderedDict = OrderedDict()
 
     def _convert_klines(
         self,
-        klines: List[List]
-    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        """Convert klines to numpy arrays"""
+        klines: Union[List[List], np.ndarray, Dict[str, np.ndarray]]
+    ) -> Tuple[np.ndarray, ...]:
+        """Convert klines to numpy arrays
+        
+        Accepts Binance REST klines, a numeric array in the same column
+        order, or the field arrays produced by klines_to_array.
+        """
         try:
+            if isinstance(klines, dict):
+                # Already parsed into field arrays
+                return tuple(klines[name] for name in KLINE_FIELDS)
+                
+            # Parse all OHLCV columns in a single conversion
+            data = parse_klines(klines)
+            
             # Extract OHLCV data
-            opens = np.array([float(k[1]) for k in klines])
-            highs = np.array([float(k[2]) for k in klines])
-            lows = np.array([float(k[3]) for k in klines])
-            closes = np.array([float(k[4]) for k in klines])
-            volumes = np.array([float(k[5]) for k in klines])
+            times = data[:, 0]
+            opens = data[:, 1]
+            highs = data[:, 2]
+            lows = data[:, 3]
+            closes = data[:, 4]
+            volumes = data[:, 5]
             
-            return opens, highs, lows, closes, volumes
+            return times, opens, highs, lows, closes, volumes
             
         except Exception as e:
             self.logger.error(f"Error converting klines: {str(e)}")
-            return None, None, None, None, None
+            return None, None, None, None, None, None
+
+    def _validate_klines(
+        self,
+        closes: Optional[np.ndarray],
+        volumes: Optional[np.ndarray],
+        min_len: int = MIN_KLINES
+    ) -> bool:
+        """Check klines once so the indicator helpers can skip error handling"""
+        if closes is None or len(closes) < min_len:
+            return False
+        return bool(np.isfinite(closes).all() and np.isfinite(volumes).all())
 
     def _sma(self, data: np.ndarray, period: int) -> np.ndarray:
         """Calculate Simple Moving Average"""
-        return np.convolve(data, np.ones(period)/period, mode='valid')
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        sma = np.empty(max(len(data) - period + 1, 0))
+        if len(sma):
+            _sma_kernel(data, period, sma)
+        return sma
 
-    def _rsi(self, closes: np.ndarray, period: int = 14) -> np.ndarray:
-        """Calculate Relative Strength Index"""
-        deltas = np.diff(closes)
-        seed = deltas[:period+1]
-        up = seed[seed >= 0].sum()/period
-        down = -seed[seed < 0].sum()/period
-        rs = up/down
-        rsi = np.zeros_like(closes)
-        rsi[:period] = 100. - 100./(1. + rs)
-
-        for i in range(period, len(closes)):
-            delta = deltas[i-1]
-            if delta > 0:
-                upval = delta
-                downval = 0.
-            else:
-                upval = 0.
-                downval = -delta
-
-            up = (up*(period-1) + upval)/period
-            down = (down*(period-1) + downval)/period
-            rs = up/down
-            rsi[i] = 100. - 100./(1. + rs)
+    def _sma_tail(self, data: np.ndarray, period: int, k: int = 1) -> np.ndarray:
+        """Calculate only the last k values of the Simple Moving Average"""
+        return self._sma(data[-(period + k - 1):], period)
 
+    def _rsi(self, closes: np.ndarray, period: int = _RSI_PERIOD) -> np.ndarray:
+        """Calculate Relative Strength Index"""
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        # Every element is written by the kernel, so skip zero-filling
+        rsi = np.empty_like(closes)
+        _wilder_kernel(closes, period, rsi)
         return rsi
 
-    def _bollinger_bands(
+    def _indicator_state(
         self,
+        key: Tuple[str, str],
+        times: np.ndarray,
         closes: np.ndarray,
-        period: int = 20,
-        num_std: int = 2
-    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Calculate Bollinger Bands"""
-        middle = self._sma(closes, period)
-        std = np.std(closes[-period:])
-        upper = middle + (std * num_std)
-        lower = middle - (std * num_std)
-        return upper, middle, lower
-
-    def _check_volume(
-        self,
         volumes: np.ndarray
-    ) -> bool:
-        """Check volume conditions"""
-        try:
-            # Calculate volume MA
-            volume_ma = self._sma(volumes, Config.VOLUME_PERIOD)[-1]
-            
-            # Get current values
-            curr_vol = volumes[-1]
-            
-            # Volume ratio
-            volume_ratio = curr_vol / volume_ma if volume_ma > 0 else 0
-            
-            # Check conditions
-            if volume_ratio < Config.VOLUME_RATIO_MIN:
-                return False
-                
-            # Check trend
-            vol_trend = all(volumes[-5:] >= volumes[-6:-1])
-            if not vol_trend:
-                return False
-                
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error checking volume: {str(e)}")
-            return False
-
-    def _check_trend(
-        self,
-        closes: np.ndarray
-    ) -> Optional[str]:
-        """Determine price trend"""
-        try:
-            # Calculate MAs
-            fast_ma = self._sma(closes, Config.FAST_MA)
-            slow_ma = self._sma(closes, Config.SLOW_MA)
-            
-            # Get last values
-            curr_fast = fast_ma[-1]
-            curr_slow = slow_ma[-1]
-            
-            # Check crossover
-            if curr_fast > curr_slow:
-                # Check trend strength
-                if all(fast_ma[-5:] > slow_ma[-5:]):
-                    return SignalType.LONG.value
-                    
-            elif curr_fast < curr_slow:
-                # Check trend strength  
-                if all(fast_ma[-5:] < slow_ma[-5:]):
-                    return SignalType.SHORT.value
-                    
+    ) -> Optional[IndicatorState]:
+        """State for key advanced to the last closed candle in the window
+        
+        Stored state is reused when its candle is still in the window, so
+        only candles closed since the previous call are folded in; else it
+        is seeded from the whole window. Returns None for windows too short
+        to seed from.
+        """
+        if len(closes) < max(_VOLUME_PERIOD + 1, MIN_KLINES):
             return None
             
-        except Exception as e:
-            self.logger.error(f"Error checking trend: {str(e)}")
-            return None
-
-    def _calculate_levels(
-        self,
-        closes: np.ndarray,
-        highs: np.ndarray,
-        lows: np.ndarray,
-        signal_type: str
-    ) -> Tuple[float, float, float]:
-        """Calculate entry, take profit and stop loss levels"""
-        try:
-            # Calculate Bollinger Bands
-            upper, middle, lower = self._bollinger_bands(closes)
-            
-            # Get current values
-            entry = closes[-1]
-            curr_upper = upper[-1]
-            curr_lower = lower[-1]
-            
-            if signal_type == SignalType.LONG.value:
-                stop_loss = curr_lower
-                take_profit = entry + ((entry - stop_loss) * 2)
-            else:
-                stop_loss = curr_upper
-                take_profit = entry - ((stop_loss - entry) * 2)
+        state = self._state.get(key)
+        idx = -1
+        if state is not None and times[0] <= state.time <= times[-2]:
+            idx = int(np.searchsorted(times, state.time))
+            if times[idx] != state.time:
+                idx = -1
                 
-            return entry, take_profit, stop_loss
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating levels: {str(e)}")
-            return 0, 0, 0
+        if idx < 0:
+            closed = closes[:-1]
+            window = volumes[-_VOLUME_PERIOD:-1].tolist()
+            close_window = closed[1 - _SLOW_MA:].tolist()
+            state = IndicatorState(
+                time=float(times[-2]),
+                volume_sum=sum(window),
+                fast_sum=sum(close_window[1 - _FAST_MA:]),
+                slow_sum=sum(close_window)
+            )
+            state.volumes.extend(window)
+            state.closes.extend(close_window)
+            state.fast_ma.extend(
+                self._sma_tail(closed, _FAST_MA, _MACD_SIGNAL - 1).tolist()
+            )
+            state.slow_ma.extend(
+                self._sma_tail(closed, _SLOW_MA, _MACD_SIGNAL - 1).tolist()
+            )
+            self._state[key] = state
+            if len(self._state) > self.max_states:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+            new = slice(idx + 1, -1)
+            for time, close, volume in zip(
+                times[new].tolist(), closes[new].tolist(), volumes[new].tolist()
+            ):
+                state.update(time, close, volume)
+                
+        return state
 
-    def _calculate_confidence(
-        self,
-        closes: np.ndarray,
-        volumes: np.ndarray,
-        signal_type: str
-    ) -> float:
-        """Calculate signal confidence score"""
-        try:
-            # Calculate indicators
-            rsi = self._rsi(closes)
-            
-            # Moving averages
-            fast_ma = self._sma(closes, 12)
-            slow_ma = self._sma(closes, 26)
-            
-            # MACD line
-            macd = fast_ma - slow_ma
-            
-            # Signal line
-            signal = self._sma(macd, 9)
-            
-            # Volume ratio
-            vol_ma = self._sma(volumes, Config.VOLUME_PERIOD)[-1]
-            vol_ratio = volumes[-1] / vol_ma if vol_ma > 0 else 0
-            
-            # Get current values
-            curr_rsi = rsi[-1]
-            curr_macd = macd[-1]
-            curr_signal = signal[-1]
-            
-            confidence = 0
-            
-            # Trend score (0-30)
-            trend_score = 30 if (
-                (signal_type == SignalType.LONG.value and curr_macd > curr_signal) or
-                (signal_type == SignalType.SHORT.value and curr_macd < curr_signal)
-            ) else 0
-            
-            # Volume score (0-30)
-            volume_score = min(30, vol_ratio * 10)
-            
-            # RSI score (0-20)
-            rsi_score = 20 if 30 < curr_rsi < 70 else 0
-            
-            # MACD score (0-20)
-            macd_score = 20 if abs(curr_macd - curr_signal) > 0 else 0
-            
-            confidence = sum([
-                trend_score,
-                volume_score,
-                rsi_score,
-                macd_score
-            ])
-            
-            return round(confidence, 2)
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating confidence: {str(e)}")
-            return 0
+    def _volume_ratio(self, volumes: np.ndarray) -> float:
+        """Current volume relative to its moving average"""
+        volume_ma = self._sma(volumes, _VOLUME_PERIOD)[-1]
+        return volumes[-1] / volume_ma if volume_ma > 0 else 0
 
     async def analyze_klines(
         self,
         symbol: str,
-        klines: List[List]
-    ) -> Optional[Dict]:
+        klines: Union[List[List], np.ndarray, Dict[str, np.ndarray]],
+        interval: str = ''
+    ) -> Optional[Signal]:
         """Analyze klines data for trading signals"""
         try:
             # Convert klines
-            opens, highs, lows, closes, volumes = self._convert_klines(klines)
+            times, opens, highs, lows, closes, volumes = self._convert_klines(klines)
             
-            if closes is None:
+            if not self._validate_klines(closes, volumes):
                 return None
                 
-            # Check volume
-            if not self._check_volume(volumes):
+            # All features in one pass
+            state = self._indicator_state((symbol, interval), times, closes, volumes)
+            # Only the last 9 MA values are used, for the MACD signal
+            if state is not None:
+                volume_ratio = state.volume_ratio(float(volumes[-1]))
+                fast_ma, slow_ma = state.moving_averages(float(closes[-1]))
+            else:
+                volume_ratio = self._volume_ratio(volumes)
+                fast_ma = self._sma_tail(closes, _FAST_MA, _MACD_SIGNAL)
+                slow_ma = self._sma_tail(closes, _SLOW_MA, _MACD_SIGNAL)
+            fast_tail = fast_ma[-5:]
+            slow_tail = slow_ma[-5:]
+            
+            # Volume: above average and rising for the last 5 candles
+            if volume_ratio < _VOLUME_RATIO_MIN:
+                return None
+            if not (volumes[-5:] >= volumes[-6:-1]).all():
                 return None
                 
-            # Check trend
-            signal_type = self._check_trend(closes)
-            if not signal_type:
+            # Trend: fast MA on one side of the slow MA for 5 candles
+            if (fast_tail > slow_tail).all():
+                signal_type = _LONG
+            elif (fast_tail < slow_tail).all():
+                signal_type = _SHORT
+            else:
                 return None
                 
-            # Calculate levels
-            entry, tp, sl = self._calculate_levels(
-                closes,
-                highs,
-                lows,
-                signal_type
-            )
-            
-            if not all([entry, tp, sl]):
+            # Confidence: volume (0-30) and RSI (0-20) first; trend (0-30)
+            # and MACD (0-20) can add at most 50
+            # RSI is recomputed over the window on every call
+            rsi = self._rsi(closes)[-1]
+            confidence = min(30, volume_ratio * 10)
+            if 30 < rsi < 70:
+                confidence += 20
+            if round(confidence + 50, 2) < _MIN_CONFIDENCE:
                 return None
                 
-            # Calculate confidence
-            confidence = self._calculate_confidence(
-                closes,
-                volumes,
-                signal_type
-            )
+            # Levels from the latest Bollinger Bands
+            entry = float(closes[-1])
+            last_window = closes[-20:]
+            band_width = float(last_window.std()) * 2
+            middle = float(last_window.mean())
+            if signal_type == _LONG:
+                sl = middle - band_width
+                tp = entry + ((entry - sl) * 2)
+            else:
+                sl = middle + band_width
+                tp = entry - ((sl - entry) * 2)
+                
+            if not (entry and tp and sl):
+                return None
+                
+            # Trend and MACD part of the confidence
+            macd = fast_ma - slow_ma
+            curr_macd = macd[-1]
+            curr_signal = macd.mean()
+            
+            if (curr_macd > curr_signal if signal_type == _LONG
+                    else curr_macd < curr_signal):
+                confidence += 30
+            if curr_macd != curr_signal:
+                confidence += 20
+            confidence = round(confidence, 2)
             
-            if confidence < Config.MIN_CONFIDENCE:
+            if confidence < _MIN_CONFIDENCE:
                 return None
                 
             # Create signal
-            signal = {
-                'symbol': symbol,
-                'type': signal_type,
-                'entry_price': round(entry, 8),
-                'take_profit': round(tp, 8),
-                'stop_loss': round(sl, 8),
-                'confidence': confidence,
-                'rsi': round(self._rsi(closes)[-1], 2),
-                'volume_ratio': round(
-                    volumes[-1] / self._sma(volumes, Config.VOLUME_PERIOD)[-1]
-                    if volumes[-1] > 0 else 0,
-                    2
-                ),
-                'time': int(datetime.utcnow().timestamp() * 1000)
-            }
-            
-            return signal
+            return self._build_signal(
+                symbol,
+                signal_type,
+                entry,
+                tp,
+                sl,
+                confidence,
+                rsi,
+                volume_ratio
+            )
             
         except Exception as e:
             self.logger.error(f"Error analyzing {symbol}: {str(e)}")
             return None
 
-    def validate_signal(self, signal: Dict) -> bool:
+    def _build_signal(
+        self,
+        symbol: str,
+        signal_type: str,
+        entry: float,
+        tp: float,
+        sl: float,
+        confidence: float,
+        rsi: float,
+        volume_ratio: float
+    ) -> Optional[Signal]:
+        """Create a validated signal"""
+        try:
+            return Signal(
+                symbol=symbol,
+                type=signal_type,
+                entry_price=round(float(entry), 8),
+                take_profit=round(float(tp), 8),
+                stop_loss=round(float(sl), 8),
+                confidence=float(confidence),
+                rsi=round(float(rsi), 2),
+                volume_ratio=round(float(volume_ratio), 2),
+                time=int(time.time() * 1000)
+            )
+        except ValueError as e:
+            self.logger.debug(f"Rejected signal for {symbol}: {str(e)}")
+            return None
+
+    def validate_signal(self, signal: Union[Signal, Dict]) -> bool:
         """Validate trading signal"""
         try:
+            # Signal objects are validated when created
+            if isinstance(signal, Signal):
+                return True
+                
             required_fields = [
                 'symbol',
                 'type',
@@ -322,12 +482,12 @@ class SignalAnalyzer:
                 
             # Validate values
             if signal['type'] not in [
-                SignalType.LONG.value,
-                SignalType.SHORT.value
+                _LONG,
+                _SHORT
             ]:
                 return False
                 
-            if signal['confidence'] < Config.MIN_CONFIDENCE:
+            if signal['confidence'] < _MIN_CONFIDENCE:
                 return False
                 
             if signal['entry_price'] <= 0:
@@ -338,7 +498,7 @@ class SignalAnalyzer:
             tp = signal['take_profit']
             sl = signal['stop_loss']
             
-            if signal['type'] == SignalType.LONG.value:
+            if signal['type'] == _LONG:
                 risk = entry - sl
                 reward = tp - entry
             else:
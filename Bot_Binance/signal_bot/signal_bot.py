@@ -7,42 +7,297 @@ Date: 2025-05-24
 
 import os
 import sys
+import json
 import logging
 import asyncio
-from datetime import datetime, timedelta
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import numpy as np
-import pandas as pd
-from binance.client import Client
 
-class TechnicalAnalyzer:
-    """Technical Analysis calculations without TA-Lib"""
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
+# Add project root to path for imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from shared.binance_client import PooledAsyncClient
+from shared.kline_stream import KlineStream
+from shared.constants import Config, DatabaseConfig, MessageType
+from signal_bot._njit import njit, NUMBA_AVAILABLE
+
+# Structure-of-arrays view of a klines window, one contiguous array per field
+KlinesSoA = namedtuple('KlinesSoA', 'time open high low close volume')
+
+# Candle length of each scanned timeframe
+INTERVAL_SECONDS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '4h': 14400,
+    '1d': 86400
+}
+
+# Typed klines buffer returned by SignalBot._get_klines. Prices and volumes
+# are only compared against thresholds, so single precision is plenty and
+# halves the memory the kernels stream through
+KLINE_DTYPE = np.dtype([
+    ('time', 'i8'),
+    ('open', 'f4'),
+    ('high', 'f4'),
+    ('low', 'f4'),
+    ('close', 'f4'),
+    ('volume', 'f4')
+])
+
+# Compiled kernels load float32 and accumulate in float64; the plain Python
+# fallback would keep float32 arithmetic throughout, so it gets float64
+PRICE_DTYPE = np.float32 if NUMBA_AVAILABLE else np.float64
+
+def _rows_to_klines(rows: list) -> np.ndarray:
+    """Parse Binance REST kline rows into a KLINE_DTYPE array in one pass"""
+    klines = np.empty(len(rows), dtype=KLINE_DTYPE)
+    if not len(rows):
+        return klines
+        
+    # Every field is a number or numeric string; only the six stored
+    # ones are parsed
+    data = np.array([row[:6] for row in rows], dtype=np.float64)
+    for i, name in enumerate(KLINE_DTYPE.names):
+        klines[name] = data[:, i]
+    return klines
+
+def _to_soa(klines) -> KlinesSoA:
+    """Extract all kline fields in a single pass"""
+    if isinstance(klines, KlinesSoA):
+        return klines
+        
+    if isinstance(klines, np.ndarray) and klines.dtype.names:
+        # Typed buffer: every field is already a view, nothing to parse
+        return KlinesSoA(*(klines[name] for name in KLINE_DTYPE.names))
+        
+    if len(klines) and not isinstance(klines[0], dict):
+        # Raw REST rows: parse straight into a typed buffer
+        return _to_soa(_rows_to_klines(klines))
+        
+    # Kline dicts: one C-level lookup per row instead of six subscripts,
+    # and a single float conversion for the whole window
+    fields = itemgetter('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    data = np.array(list(map(fields, klines)), dtype=np.float64).reshape(-1, 6)
     
-    @staticmethod
-    def calculate_rsi(prices: np.array, period: int = 14) -> float:
-        """Calculate RSI (Relative Strength Index)"""
-        try:
-            # Calculate price changes
-            deltas = np.diff(prices)
-            
-            # Separate gains and losses
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            
-            # Calculate average gains and losses
-            avg_gains = np.mean(gains[:period])
-            avg_losses = np.mean(losses[:period])
-            
-            if avg_losses == 0:
-                return 100.0
+    # Transpose and copy so each field is contiguous in memory
+    return KlinesSoA(*data.T.copy())
+
+@njit(cache=True, nogil=True)
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponentially weighted mean, as pandas ewm(alpha=alpha, adjust=False)"""
+    n = len(values)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    avg = values[0]
+    out[0] = avg
+    for i in range(1, n):
+        avg = (1 - alpha) * avg + alpha * values[i]
+        out[i] = avg
+    return out
+
+@njit(cache=True, nogil=True)
+def _ewm_last(values: np.ndarray, alpha: float) -> float:
+    """Last value of _ewm without building the series"""
+    n = len(values)
+    if n == 0:
+        return np.nan
+    avg = values[0]
+    for i in range(1, n):
+        avg = (1 - alpha) * avg + alpha * values[i]
+    return avg
+
+@njit(cache=True, nogil=True)
+def _ewm_rows(values: np.ndarray, alpha: float) -> np.ndarray:
+    """_ewm of every row of a (symbols, candles) matrix"""
+    out = np.empty(values.shape)
+    for r in range(values.shape[0]):
+        out[r] = _ewm(values[r], alpha)
+    return out
+
+@njit(cache=True, nogil=True)
+def _ewm_rows_last(values: np.ndarray, alpha: float) -> np.ndarray:
+    """_ewm_last of every row of a (symbols, candles) matrix"""
+    out = np.empty(values.shape[0])
+    for r in range(values.shape[0]):
+        out[r] = _ewm_last(values[r], alpha)
+    return out
+
+@njit(cache=True, nogil=True)
+def _ema_last(prices: np.ndarray, period: int) -> float:
+    """Latest EMA"""
+    return _ewm_last(prices, 2 / (period + 1))
+
+@njit(cache=True, nogil=True)
+def _rsi_last(prices: np.ndarray, period: int) -> float:
+    """Latest RSI, smoothing gains and losses in the same pass"""
+    n = len(prices)
+    if n < 2:
+        return 50.0
+    alpha = 1 / period
+    delta = prices[1] - prices[0]
+    avg_gain = max(delta, 0.0)
+    avg_loss = max(-delta, 0.0)
+    for i in range(2, n):
+        delta = prices[i] - prices[i-1]
+        avg_gain = (1 - alpha) * avg_gain + alpha * max(delta, 0.0)
+        avg_loss = (1 - alpha) * avg_loss + alpha * max(-delta, 0.0)
+    if avg_loss == 0:
+        return 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+@njit(cache=True, nogil=True)
+def _bb_last(prices: np.ndarray, period: int, std_dev: float) -> Tuple[float, float, float]:
+    """Latest (upper, middle, lower) band with a sample standard deviation"""
+    n = len(prices)
+    if n < period or period < 2:
+        return np.nan, np.nan, np.nan
+    total = 0.0
+    for i in range(n - period, n):
+        total += prices[i]
+    middle = total / period
+    squares = 0.0
+    for i in range(n - period, n):
+        squares += (prices[i] - middle) ** 2
+    std = (squares / (period - 1)) ** 0.5
+    return middle + std_dev * std, middle, middle - std_dev * std
+
+@njit(cache=True, nogil=True)
+def _all_indicators(closes: np.ndarray, volumes: np.ndarray) -> Tuple[float, ...]:
+    """Every signal indicator from one pass over closes and volumes
+    
+    Returns (rsi, macd, signal, hist, bb_upper, bb_middle, bb_lower,
+    sma_50, ema_21, avg_volume), each NaN when the window is too short,
+    matching the TechnicalAnalyzer defaults.
+    """
+    n = len(closes)
+    nan = np.nan
+    if n == 0:
+        return nan, nan, nan, nan, nan, nan, nan, nan, nan, nan
+        
+    rsi_alpha = 1 / 14
+    fast_alpha = 2 / 13
+    slow_alpha = 2 / 27
+    signal_alpha = 2 / 10
+    ema_21_alpha = 2 / 22
+    bb_start = n - 20
+    sma_start = n - 50
+    
+    ema_fast = closes[0]
+    ema_slow = closes[0]
+    signal = 0.0
+    ema_21 = closes[0]
+    avg_gain = 0.0
+    avg_loss = 0.0
+    bb_count = 0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    sma_total = 0.0
+    volume_total = 0.0
+    
+    for i in range(n):
+        price = closes[i]
+        volume_total += volumes[i]
+        
+        if i > 0:
+            # Wilder's smoothing, seeded with the first delta
+            delta = price - closes[i - 1]
+            gain = max(delta, 0.0)
+            loss = max(-delta, 0.0)
+            if i == 1:
+                avg_gain = gain
+                avg_loss = loss
+            else:
+                avg_gain = (1 - rsi_alpha) * avg_gain + rsi_alpha * gain
+                avg_loss = (1 - rsi_alpha) * avg_loss + rsi_alpha * loss
                 
-            rs = avg_gains / avg_losses
-            rsi = 100 - (100 / (1 + rs))
+            ema_fast = (1 - fast_alpha) * ema_fast + fast_alpha * price
+            ema_slow = (1 - slow_alpha) * ema_slow + slow_alpha * price
+            signal = (1 - signal_alpha) * signal + signal_alpha * (ema_fast - ema_slow)
+            ema_21 = (1 - ema_21_alpha) * ema_21 + ema_21_alpha * price
+            
+        if i >= bb_start:
+            # Welford's running mean and variance over the last 20 closes
+            bb_count += 1
+            delta = price - bb_mean
+            bb_mean += delta / bb_count
+            bb_m2 += delta * (price - bb_mean)
             
-            return float(rsi)
+        if i >= sma_start:
+            sma_total += price
             
-        except Exception:
-            return 50.0  # Neutral value on error
+    if n < 15:
+        rsi = nan
+    elif avg_loss == 0:
+        rsi = 100.0
+    else:
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        
+    if n < 26:
+        macd = nan
+        signal = nan
+    else:
+        macd = ema_fast - ema_slow
+        
+    if n < 20:
+        bb_upper = nan
+        bb_middle = nan
+        bb_lower = nan
+    else:
+        std = (bb_m2 / 19) ** 0.5
+        bb_upper = bb_mean + 2 * std
+        bb_middle = bb_mean
+        bb_lower = bb_mean - 2 * std
+        
+    sma_50 = sma_total / 50 if n >= 50 else nan
+    if n < 21:
+        ema_21 = nan
+        
+    return (rsi, macd, signal, macd - signal, bb_upper, bb_middle, bb_lower,
+            sma_50, ema_21, volume_total / n)
+
+def warm_up_indicators():
+    """Compile the indicator kernels before the first scan"""
+    prices = np.linspace(1.0, 2.0, 50, dtype=PRICE_DTYPE)
+    _ewm(prices, 0.5)
+    _ewm_rows(prices.reshape(2, -1), 0.5)
+    _ewm_rows_last(prices.reshape(2, -1), 0.5)
+    _ema_last(prices, 21)
+    _rsi_last(prices, 14)
+    _bb_last(prices, 20, 2.0)
+    _all_indicators(prices, prices)
+
+def _as_prices(prices) -> np.ndarray:
+    """Contiguous prices in the layout the kernels are compiled for"""
+    return np.ascontiguousarray(prices, dtype=PRICE_DTYPE)
+
+class TechnicalAnalyzer:
+    """Technical Analysis calculations without TA-Lib
+    
+    Every calculation returns NaN when there are too few prices.
+    """
+    
+    @staticmethod
+    def calculate_rsi(prices: np.ndarray, period: int = 14) -> float:
+        """Calculate RSI (Relative Strength Index) with Wilder's smoothing"""
+        if len(prices) < period + 1:
+            return np.nan
+        return float(_rsi_last(_as_prices(prices), period))
             
     @staticmethod
     def calculate_macd(prices: np.array, 
@@ -50,75 +305,44 @@ class TechnicalAnalyzer:
                       slow_period: int = 26,
                       signal_period: int = 9) -> Tuple[float, float, float]:
         """Calculate MACD (Moving Average Convergence Divergence)"""
-        try:
-            # Convert to pandas Series for easier calculation
-            close_prices = pd.Series(prices)
-            
-            # Calculate EMAs
-            ema_fast = close_prices.ewm(span=fast_period, adjust=False).mean()
-            ema_slow = close_prices.ewm(span=slow_period, adjust=False).mean()
-            
-            # Calculate MACD line
-            macd_line = ema_fast - ema_slow
-            
-            # Calculate signal line
-            signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-            
-            # Calculate histogram
-            histogram = macd_line - signal_line
-            
-            return (
-                float(macd_line.iloc[-1]),
-                float(signal_line.iloc[-1]),
-                float(histogram.iloc[-1])
-            )
-            
-        except Exception:
-            return 0.0, 0.0, 0.0
+        if len(prices) < slow_period:
+            return np.nan, np.nan, np.nan
+        prices = _as_prices(prices)
+        
+        # Calculate EMAs
+        ema_fast = _ewm(prices, 2 / (fast_period + 1))
+        ema_slow = _ewm(prices, 2 / (slow_period + 1))
+        
+        # Calculate MACD line
+        macd_line = ema_fast - ema_slow
+        
+        # Calculate signal line
+        signal_line = float(_ema_last(macd_line, signal_period))
+        
+        # Calculate histogram
+        macd = float(macd_line[-1])
+        histogram = macd - signal_line
+        
+        return macd, signal_line, histogram
             
     @staticmethod
     def calculate_bb(prices: np.array, period: int = 20, std_dev: int = 2) -> Tuple[float, float, float]:
         """Calculate Bollinger Bands"""
-        try:
-            # Convert to pandas Series
-            close_prices = pd.Series(prices)
-            
-            # Calculate middle band (SMA)
-            middle_band = close_prices.rolling(window=period).mean()
-            
-            # Calculate standard deviation
-            std = close_prices.rolling(window=period).std()
-            
-            # Calculate upper and lower bands
-            upper_band = middle_band + (std_dev * std)
-            lower_band = middle_band - (std_dev * std)
-            
-            return (
-                float(upper_band.iloc[-1]),
-                float(middle_band.iloc[-1]),
-                float(lower_band.iloc[-1])
-            )
-            
-        except Exception:
-            price = prices[-1]
-            return price, price, price
+        return _bb_last(_as_prices(prices), period, float(std_dev))
             
     @staticmethod
     def calculate_sma(prices: np.array, period: int) -> float:
         """Calculate Simple Moving Average"""
-        try:
-            return float(np.mean(prices[-period:]))
-        except Exception:
-            return prices[-1]
+        if len(prices) < period:
+            return np.nan
+        return float(np.mean(prices[-period:]))
             
     @staticmethod
     def calculate_ema(prices: np.array, period: int) -> float:
         """Calculate Exponential Moving Average"""
-        try:
-            close_prices = pd.Series(prices)
-            return float(close_prices.ewm(span=period, adjust=False).mean().iloc[-1])
-        except Exception:
-            return prices[-1]
+        if len(prices) < period:
+            return np.nan
+        return float(_ema_last(_as_prices(prices), period))
 
 class SignalGenerator:
     """Generate trading signals based on technical analysis"""
@@ -127,84 +351,209 @@ class SignalGenerator:
         self.logger = logger
         self.analyzer = TechnicalAnalyzer()
         
-    def generate_signal(self, symbol: str, klines: List[dict]) -> Optional[Dict]:
+    def generate_signal(self, symbol: str, klines: np.ndarray) -> Optional[Dict]:
         """Generate trading signal from klines data"""
         try:
-            # Convert klines to numpy arrays
-            closes = np.array([float(k['close']) for k in klines])
-            volumes = np.array([float(k['volume']) for k in klines])
+            # Convert klines to numpy arrays once
+            soa = _to_soa(klines)
+            closes = soa.close
+            volumes = soa.volume
             
             # Current values
-            current_price = closes[-1]
-            current_volume = volumes[-1]
-            avg_volume = np.mean(volumes)
+            current_price = float(closes[-1])
+            current_volume = float(volumes[-1])
             
-            # Calculate indicators
-            rsi = self.analyzer.calculate_rsi(closes)
-            macd, signal, hist = self.analyzer.calculate_macd(closes)
-            upper_bb, middle_bb, lower_bb = self.analyzer.calculate_bb(closes)
+            # Calculate every indicator in one pass
+            (rsi, macd, signal, hist, upper_bb, middle_bb, lower_bb,
+             sma_50, ema_21, avg_volume) = _all_indicators(
+                _as_prices(closes), _as_prices(volumes)
+            )
             
-            # Additional indicators
-            sma_50 = self.analyzer.calculate_sma(closes, 50)
-            ema_21 = self.analyzer.calculate_ema(closes, 21)
+            # Both signals need high volume and an RSI extreme
+            if current_volume <= avg_volume * 1.5:
+                return None
+            if not np.isfinite(rsi) or 30 <= rsi <= 70:
+                return None
+            if not (np.isfinite(hist) and np.isfinite(upper_bb)):
+                return None
+                
+            return self._evaluate(
+                symbol, current_price, current_volume, avg_volume,
+                rsi, macd, signal, hist, upper_bb, middle_bb, lower_bb,
+                sma_50, ema_21
+            )
             
-            # Generate signal
-            signal_data = {
-                'symbol': symbol,
-                'timestamp': datetime.utcnow(),
-                'price': current_price,
-                'volume': current_volume,
-                'volume_ratio': current_volume / avg_volume,
-                'indicators': {
-                    'rsi': rsi,
-                    'macd': macd,
-                    'signal': signal,
-                    'hist': hist,
-                    'bb_upper': upper_bb,
-                    'bb_middle': middle_bb,
-                    'bb_lower': lower_bb,
-                    'sma_50': sma_50,
-                    'ema_21': ema_21
-                }
-            }
+        except Exception as e:
+            self.logger.error(f"Error generating signal for {symbol}: {str(e)}")
+            return None
+    def generate_signals_batch(self, klines_by_symbol: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+        """Generate signals for many symbols at once
+        
+        Windows of equal length are stacked into (symbols, candles)
+        matrices so every indicator is computed for all symbols in one
+        call; any symbol with a different window length falls back to
+        generate_signal.
+        """
+        signals = {}
+        try:
+            lengths = [len(k) for k in klines_by_symbol.values() if len(k)]
+            if not lengths:
+                return signals
+            length = max(set(lengths), key=lengths.count)
             
-            # Signal logic
-            if (rsi < 30 and 
-                current_price < lower_bb and
-                current_volume > avg_volume * 1.5 and
-                hist > 0):
-                # Strong buy signal
-                signal_data['type'] = 'BUY'
-                signal_data['strength'] = min(100, (30 - rsi) * 3.33)
-                signal_data['reason'] = (
-                    f"RSI oversold ({rsi:.1f}), "
-                    f"Price below BB ({current_price:.2f} < {lower_bb:.2f}), "
-                    f"High volume (150% above avg), "
-                    f"Positive MACD histogram"
-                )
+            symbols = []
+            rows = []
+            for symbol, klines in klines_by_symbol.items():
+                if not len(klines):
+                    continue
+                if len(klines) != length:
+                    signal = self.generate_signal(symbol, klines)
+                    if signal:
+                        signals[symbol] = signal
+                    continue
+                soa = _to_soa(klines)
+                symbols.append(symbol)
+                rows.append((soa.close, soa.volume))
                 
-            elif (rsi > 70 and
-                  current_price > upper_bb and
-                  current_volume > avg_volume * 1.5 and
-                  hist < 0):
-                # Strong sell signal  
-                signal_data['type'] = 'SELL'
-                signal_data['strength'] = min(100, (rsi - 70) * 3.33)
-                signal_data['reason'] = (
-                    f"RSI overbought ({rsi:.1f}), "
-                    f"Price above BB ({current_price:.2f} > {upper_bb:.2f}), "
-                    f"High volume (150% above avg), "
-                    f"Negative MACD histogram"
-                )
+            if not symbols:
+                return signals
                 
-            else:
-                return None
+            closes = _as_prices(np.stack([r[0] for r in rows]))
+            volumes = _as_prices(np.stack([r[1] for r in rows]))
+            
+            # Cheap gates first: both signals need high volume
+            current_volume = volumes[:, -1]
+            avg_volume = volumes.mean(axis=1)
+            keep = np.flatnonzero(current_volume > avg_volume * 1.5)
+            if not len(keep):
+                return signals
+            symbols = [symbols[i] for i in keep]
+            closes = closes[keep]
+            current_volume = current_volume[keep]
+            avg_volume = avg_volume[keep]
+            
+            # RSI with Wilder's smoothing
+            deltas = np.diff(closes, axis=1)
+            avg_gains = _ewm_rows_last(np.maximum(deltas, 0.0), 1 / 14)
+            avg_losses = _ewm_rows_last(-np.minimum(deltas, 0.0), 1 / 14)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = np.where(
+                    avg_losses == 0,
+                    100.0,
+                    100 - (100 / (1 + avg_gains / avg_losses))
+                )
                 
-            return signal_data
+            # ...and an RSI extreme
+            keep = np.flatnonzero((rsi < 30) | (rsi > 70))
+            if not len(keep):
+                return signals
+            symbols = [symbols[i] for i in keep]
+            closes = closes[keep]
+            current_volume = current_volume[keep]
+            avg_volume = avg_volume[keep]
+            rsi = rsi[keep]
+            
+            # MACD
+            ema_fast = _ewm_rows(closes, 2 / 13)
+            ema_slow = _ewm_rows(closes, 2 / 27)
+            macd_line = ema_fast - ema_slow
+            macd = macd_line[:, -1]
+            signal = _ewm_rows_last(macd_line, 2 / 10)
+            hist = macd - signal
+            
+            # Bollinger Bands
+            middle_bb = closes[:, -20:].mean(axis=1)
+            std = closes[:, -20:].std(axis=1, ddof=1)
+            upper_bb = middle_bb + 2 * std
+            lower_bb = middle_bb - 2 * std
+            
+            # Additional indicators
+            sma_50 = closes[:, -50:].mean(axis=1)
+            ema_21 = _ewm_rows_last(closes, 2 / 22)
+            
+            current_price = closes[:, -1]
+            
+            # Only build dicts for rows that can pass either branch
+            candidates = (
+                ((rsi < 30) & (current_price < lower_bb) & (hist > 0)) |
+                ((rsi > 70) & (current_price > upper_bb) & (hist < 0))
+            )
+            
+            for i in np.flatnonzero(candidates):
+                signal_data = self._evaluate(
+                    symbols[i], float(current_price[i]), float(current_volume[i]), float(avg_volume[i]),
+                    float(rsi[i]), float(macd[i]), float(signal[i]), float(hist[i]),
+                    float(upper_bb[i]), float(middle_bb[i]), float(lower_bb[i]),
+                    float(sma_50[i]), float(ema_21[i])
+                )
+                if signal_data:
+                    signals[symbols[i]] = signal_data
+                    
+            return signals
             
         except Exception as e:
-            self.logger.error(f"Error generating signal for {symbol}: {str(e)}")
+            self.logger.error(f"Error generating batch signals: {str(e)}")
+            return signals
+            
+    def _evaluate(self, symbol: str, current_price: float, current_volume: float,
+                  avg_volume: float, rsi: float, macd: float, signal: float,
+                  hist: float, upper_bb: float, middle_bb: float, lower_bb: float,
+                  sma_50: float, ema_21: float) -> Optional[Dict]:
+        """Apply the signal rules to computed indicators"""
+        # Generate signal
+        signal_data = {
+            'symbol': symbol,
+            'timestamp': datetime.utcnow(),
+            'price': current_price,
+            'volume': current_volume,
+            'volume_ratio': current_volume / avg_volume,
+            'indicators': {
+                'rsi': rsi,
+                'macd': macd,
+                'signal': signal,
+                'hist': hist,
+                'bb_upper': upper_bb,
+                'bb_middle': middle_bb,
+                'bb_lower': lower_bb,
+                'sma_50': sma_50,
+                'ema_21': ema_21
+            }
+        }
+        
+        # Signal logic
+        if (rsi < 30 and 
+            current_price < lower_bb and
+            current_volume > avg_volume * 1.5 and
+            hist > 0):
+            # Strong buy signal
+            signal_data['type'] = 'BUY'
+            signal_data['strength'] = min(100, (30 - rsi) * 3.33)
+            signal_data['reason'] = (
+                f"RSI oversold ({rsi:.1f}), "
+                f"Price below BB ({current_price:.2f} < {lower_bb:.2f}), "
+                f"High volume (150% above avg), "
+                f"Positive MACD histogram"
+            )
+            
+        elif (rsi > 70 and
+              current_price > upper_bb and
+              current_volume > avg_volume * 1.5 and
+              hist < 0):
+            # Strong sell signal  
+            signal_data['type'] = 'SELL'
+            signal_data['strength'] = min(100, (rsi - 70) * 3.33)
+            signal_data['reason'] = (
+                f"RSI overbought ({rsi:.1f}), "
+                f"Price above BB ({current_price:.2f} > {upper_bb:.2f}), "
+                f"High volume (150% above avg), "
+                f"Negative MACD histogram"
+            )
+            
+        else:
             return None
+            
+        return signal_data
+
 from trade_manager.trade_manager import TradeManager
 class SignalBot:
     def __init__(self, client, logger, pair_manager):
@@ -216,6 +565,7 @@ class SignalBot:
         self.signal_generator = None
         self.client = None
         self.telegram = None
+        self.ws_client = None  # Optional WebSocketClient to the trade manager
         self._is_running = False
         self.start_time = datetime.utcnow()
         self._is_testnet = True
@@ -224,21 +574,87 @@ class SignalBot:
         self.min_volume = 1000000  # Minimum 24h volume in USDT
         self.min_strength = 70     # Minimum signal strength (0-100)
         
+        # Concurrent klines requests, and the open time (epoch seconds) of
+        # the candle last scanned per (symbol, interval); 0 if never scanned
+        self.scan_concurrency = 10
+        self.scan_batch_size = 20
+        self.pipeline_depth = 4  # Fetched batches waiting for analysis
+        self._sem: Optional[asyncio.Semaphore] = None
+        self.last_scan: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._interval_sec = {
+            interval: INTERVAL_SECONDS.get(interval, 60)
+            for interval in self.timeframes
+        }
+        
+        # Latest klines window per (symbol, interval); later scans only
+        # fetch candles from the last cached one onwards
+        self.kline_limit = 100
+        self._kline_cache: Dict[Tuple[str, str], np.ndarray] = {}
+        
+        # REST request weight budget (Binance allows 1200 per minute)
+        self.weight_per_minute = 1200
+        self.klines_weight = 2
+        self._limiter = None
+        
+        # Websocket pushes keep cached klines current between scans
+        self._kline_stream: Optional[KlineStream] = None
+        
+        # Klines cache and scan state persisted across restarts
+        self.cache_path = os.path.join(PROJECT_ROOT, DatabaseConfig.SIGNAL_CACHE_PATH)
+        self.state_path = os.path.join(PROJECT_ROOT, DatabaseConfig.SIGNAL_STATE_PATH)
+        self._cycles = 0
+        
+        # Indicator work runs on threads; the kernels release the GIL
+        self._ta_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Outgoing notifications, sent by a worker so scans never wait on I/O.
+        # Signals are sent as one message per cycle; stronger ones go out
+        # right away
+        self.queue_size = 128
+        self.urgent_strength = 90
+        self.max_message_length = 4096  # Telegram limit
+        self._out_q: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        
+        # Set by stop() to end the wait between scan cycles
+        self._stop_event: Optional[asyncio.Event] = None
+        
     async def initialize(self) -> bool:
         """Initialize Signal Bot"""
         try:
             self.start_time = datetime.utcnow()
             self.signal_generator = SignalGenerator(self.logger)
+            warm_up_indicators()
+            self._ta_pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count(),
+                thread_name_prefix='indicators'
+            )
+            self._sem = asyncio.Semaphore(self.scan_concurrency)
+            self._stop_event = asyncio.Event()
+            if AsyncLimiter is not None:
+                self._limiter = AsyncLimiter(self.weight_per_minute, 60)
+            self._out_q = asyncio.Queue(maxsize=self.queue_size)
+            self._sender_task = asyncio.create_task(self._sender_loop())
             
             # Log initialization
             self.logger.info("Signal Bot initializing...")
             self.logger.info(f"Mode: {'Test Mode' if self._is_testnet else 'Production'}")
             
+            # Connect to Binance; REST calls then yield to the event loop
+            if not self._is_testnet:
+                self.client = await PooledAsyncClient.create(
+                    os.getenv('BINANCE_API_KEY'),
+                    os.getenv('BINANCE_API_SECRET')
+                )
+            
             # Load trading pairs
             if self._is_testnet:
                 self.symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']  # Test pairs
             else:
                 await self._load_symbols()
+                self._load_cache()
+                self._kline_stream = KlineStream(self._on_kline, self.logger)
+                self._kline_stream.start(self.symbols, self.timeframes)
             
             self.logger.info(f"Loaded {len(self.symbols)} trading pairs")
             
@@ -267,64 +683,283 @@ class SignalBot:
         
         while self._is_running:
             try:
-                for symbol in self.symbols:
-                    for interval in self.timeframes:
-                        # Get klines data
-                        klines = await self._get_klines(symbol, interval)
-                        if not klines:
-                            continue
-                            
-                        # Generate signal
-                        signal = self.signal_generator.generate_signal(symbol, klines)
-                        
-                        if signal and signal['strength'] >= self.min_strength:
-                            # Log signal
-                            self.logger.info(
-                                f"Signal: {signal['type']} {symbol} "
-                                f"({interval}) - Strength: {signal['strength']:.1f}%"
-                            )
-                            
-                            # Send notification
-                            if self.telegram:
-                                await self.telegram.send_message(
-                                    f"Trading Signal\n\n"
-                                    f"Symbol: {symbol}\n"
-                                    f"Type: {signal['type']}\n"
-                                    f"Timeframe: {interval}\n"
-                                    f"Price: ${signal['price']:,.2f}\n"
-                                    f"Strength: {signal['strength']:.1f}%\n"
-                                    f"Reason: {signal['reason']}\n\n"
-                                    f"Indicators:\n"
-                                    f"RSI: {signal['indicators']['rsi']:.1f}\n"
-                                    f"MACD: {signal['indicators']['macd']:.4f}\n"
-                                    f"Signal: {signal['indicators']['signal']:.4f}\n"
-                                    f"BB Upper: ${signal['indicators']['bb_upper']:,.2f}\n"
-                                    f"BB Lower: ${signal['indicators']['bb_lower']:,.2f}"
-                                )
-                        
-                        # Add delay between symbols
-                        await asyncio.sleep(0.1)
+                # Open time of the current candle per timeframe; a pair is
+                # due once a new candle has opened since its last scan
+                now = time.time()
+                buckets = {
+                    interval: int(now - now % seconds)
+                    for interval, seconds in self._interval_sec.items()
+                }
+                
+                due = [
+                    (symbol, interval)
+                    for symbol in self.symbols
+                    for interval in self.timeframes
+                    if self.last_scan[symbol, interval] != buckets[interval]
+                ]
+                
+                # Scan in small batches; fetching the next batch overlaps
+                # with analysis of the previous one
+                pending = []
+                failed = await self._scan_pipeline(due, buckets, pending)
+                    
+                # One line per cycle instead of one per failed pair
+                if failed:
+                    self.logger.warning("%d of %d scans failed", failed, len(due))
+                    
+                # Queue the rest of the cycle's signals as one notification
+                if pending:
+                    await self._queue_signals(pending)
                         
                 # Log status and wait before next scan
-                self.logger.info(
-                    f"Market scan completed - "
-                    f"Runtime: {datetime.utcnow() - self.start_time}"
-                )
-                await asyncio.sleep(60)  # 1 minute delay
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "Market scan completed - %d pairs scanned - Runtime: %s",
+                        len(due), datetime.utcnow() - self.start_time
+                    )
+                # Save the cache now and then so a restart starts warm
+                self._cycles += 1
+                if not self._is_testnet and self._cycles % DatabaseConfig.CACHE_SAVE_CYCLES == 0:
+                    await self._save_cache()
+                    
+                # Sleep until the next candle opens on any timeframe
+                now = time.time()
+                delay = min(seconds - now % seconds for seconds in self._interval_sec.values())
+                await self._wait_for_stop(max(delay, 1))
                 
             except Exception as e:
                 self.logger.error(f"Error in scan cycle: {str(e)}")
-                await asyncio.sleep(60)
+                await self._wait_for_stop(60)
+                
+    async def _wait_for_stop(self, timeout: float):
+        """Sleep for up to timeout seconds, waking early when the bot stops"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _scan_pipeline(self, due: List[Tuple[str, str]], buckets: Dict[str, int],
+                             pending: List[Tuple[str, str, Dict]]) -> int:
+        """Fetch and analyze due pairs as two pipelined stages
+        
+        Returns the number of pairs whose fetch failed. Signals go to the
+        sender queue, the third stage, as they are found.
+        """
+        batches = asyncio.Queue(maxsize=self.pipeline_depth)
+        failed = 0
+        
+        async def fetch():
+            nonlocal failed
+            try:
+                pairs = iter(due)
+                while True:
+                    batch = list(islice(pairs, self.scan_batch_size))
+                    if not batch:
+                        break
+                    klines_by_interval, batch_failed = await self._fetch_batch(batch, buckets)
+                    failed += batch_failed
+                    await batches.put(klines_by_interval)
+            finally:
+                await batches.put(None)
+                
+        async def analyze():
+            while True:
+                klines_by_interval = await batches.get()
+                if klines_by_interval is None:
+                    break
+                try:
+                    await self._analyze_batch(klines_by_interval, pending)
+                except Exception as e:
+                    # Keep draining so the fetch stage never blocks
+                    self.logger.error(f"Error analyzing batch: {str(e)}")
+                
+        await asyncio.gather(fetch(), analyze())
+        return failed
+        
+    async def _fetch_batch(self, batch: List[Tuple[str, str]],
+                           buckets: Dict[str, int]) -> Tuple[Dict[str, Dict[str, np.ndarray]], int]:
+        """Fetch klines for a batch of pairs concurrently
+        
+        Returns the klines grouped by interval and symbol, and the number
+        of pairs that failed.
+        """
+        results = await asyncio.gather(
+            *(self._scan_one(symbol, interval) for symbol, interval in batch),
+            return_exceptions=True
+        )
+        
+        klines_by_interval = defaultdict(dict)
+        failed = 0
+        for (symbol, interval), klines in zip(batch, results):
+            if isinstance(klines, Exception):
+                failed += 1
+                self.logger.debug("Error scanning %s %s: %s", symbol, interval, klines)
+            elif len(klines):
+                klines_by_interval[interval][symbol] = klines
+                self.last_scan[symbol, interval] = buckets[interval]
+                
+        return klines_by_interval, failed
+        
+    async def _analyze_batch(self, klines_by_interval: Dict[str, Dict[str, np.ndarray]],
+                             pending: List[Tuple[str, str, Dict]]):
+        """Generate signals for fetched klines and queue the strong ones"""
+        # Generate signals for every symbol of each timeframe in one pass,
+        # timeframes in parallel off the event loop
+        loop = asyncio.get_running_loop()
+        intervals = list(klines_by_interval)
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                self._ta_pool,
+                self.signal_generator.generate_signals_batch,
+                klines_by_interval[interval]
+            )
+            for interval in intervals
+        ))
+        
+        for interval, signals in zip(intervals, results):
+            for symbol, signal in signals.items():
+                if signal['strength'] >= self.min_strength:
+                    # Log signal
+                    self.logger.info(
+                        "Signal: %s %s (%s) - Strength: %.1f%%",
+                        signal['type'], symbol, interval, signal['strength']
+                    )
+                    
+                    if signal['strength'] > self.urgent_strength:
+                        await self._queue_signals([(symbol, interval, signal)])
+                    else:
+                        pending.append((symbol, interval, signal))
+        
+    async def _scan_one(self, symbol: str, interval: str) -> np.ndarray:
+        """Fetch klines for one pair, bounded by the scan semaphore"""
+        async with self._sem:
+            return await self._get_klines(symbol, interval)
+
+    async def _queue_signals(self, signals: List[Tuple[str, str, Dict]]):
+        """Queue (symbol, interval, signal) items to be sent together"""
+        try:
+            self._out_q.put_nowait(signals)
+        except asyncio.QueueFull:
+            # Backpressure: wait for the sender to catch up
+            await self._out_q.put(signals)
+            
+    async def _sender_loop(self):
+        """Send queued signals"""
+        while True:
+            signals = await self._out_q.get()
+            try:
+                if len(signals) == 1:
+                    await self.send_signal(*signals[0])
+                else:
+                    await self.send_signal_batch(signals)
+                await self._publish_signals(signals)
+            except Exception as e:
+                self.logger.error(f"Error sending signals: {str(e)}")
+            finally:
+                self._out_q.task_done()
+                
+    async def send_signal_batch(self, signals: List[Tuple[str, str, Dict]]):
+        """Send one summary notification for several signals"""
+        if not self.telegram:
+            return
+            
+        header = f"Trading Signals ({len(signals)})\n"
+        message = header
+        for symbol, interval, signal in signals:
+            line = (
+                f"\n{signal['type']} {symbol} ({interval}) "
+                f"${signal['price']:,.2f} - "
+                f"Strength: {signal['strength']:.1f}% - "
+                f"RSI: {signal['indicators']['rsi']:.1f}"
+            )
+            if len(message) + len(line) > self.max_message_length:
+                await self.telegram.send_message(message)
+                message = header
+            message += line
+            
+        await self.telegram.send_message(message)
+        
+    async def _publish_signals(self, signals: List[Tuple[str, str, Dict]]):
+        """Forward signals to the WebSocket server in a single frame"""
+        if not (self.ws_client and self.ws_client.is_connected()):
+            return
+            
+        payload = [
+            {
+                'symbol': symbol,
+                'interval': interval,
+                'type': signal['type'],
+                'price': float(signal['price']),
+                'strength': float(signal['strength']),
+                'reason': signal['reason'],
+                'timestamp': signal['timestamp'],
+                'indicators': {
+                    name: float(value)
+                    for name, value in signal['indicators'].items()
+                }
+            }
+            for symbol, interval, signal in signals
+        ]
+        if len(payload) == 1:
+            message = {'type': MessageType.SIGNAL.value, 'data': payload[0]}
+        else:
+            message = {'type': MessageType.SIGNAL_BATCH.value, 'data': payload}
+        await self.ws_client.send_message(message)
+        
+    async def send_signal(self, symbol: str, interval: str, signal: Dict):
+        """Send signal notification"""
+        if self.telegram:
+            await self.telegram.send_message(
+                f"Trading Signal\n\n"
+                f"Symbol: {symbol}\n"
+                f"Type: {signal['type']}\n"
+                f"Timeframe: {interval}\n"
+                f"Price: ${signal['price']:,.2f}\n"
+                f"Strength: {signal['strength']:.1f}%\n"
+                f"Reason: {signal['reason']}\n\n"
+                f"Indicators:\n"
+                f"RSI: {signal['indicators']['rsi']:.1f}\n"
+                f"MACD: {signal['indicators']['macd']:.4f}\n"
+                f"Signal: {signal['indicators']['signal']:.4f}\n"
+                f"BB Upper: ${signal['indicators']['bb_upper']:,.2f}\n"
+                f"BB Lower: ${signal['indicators']['bb_lower']:,.2f}"
+            )
 
     async def stop(self):
         """Stop Signal Bot"""
         try:
             self._is_running = False
+            if self._stop_event:
+                self._stop_event.set()
             runtime = datetime.utcnow() - self.start_time
             
             self.logger.info(f"Signal Bot stopping...")
             self.logger.info(f"Total runtime: {runtime}")
             
+            # Finish sending queued signals
+            if self._sender_task:
+                try:
+                    await asyncio.wait_for(self._out_q.join(), timeout=10)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Dropped unsent signals on stop")
+                self._sender_task.cancel()
+                self._sender_task = None
+                
+            if self._kline_stream:
+                await self._kline_stream.stop()
+                self._kline_stream = None
+                
+            if not self._is_testnet:
+                await self._save_cache()
+                
+            if self._ta_pool:
+                self._ta_pool.shutdown(wait=True)
+                self._ta_pool = None
+                
+            if self.client:
+                await self.client.close_connection()
+                self.client = None
+            
             if self.telegram:
                 await self.telegram.send_message(
                     "Signal Bot Stopping\n\n"
@@ -335,50 +970,161 @@ class SignalBot:
         except Exception as e:
             self.logger.error(f"Error stopping Signal Bot: {str(e)}")
             
-    async def _get_klines(self, symbol: str, interval: str) -> List[dict]:
-        """Get klines/candlestick data"""
+    async def _load_symbols(self):
+        """Load USDT pairs above the minimum 24h volume"""
+        tickers = await self.client.get_ticker()
+        quote = Config.QUOTE_ASSET
+        min_volume = self.min_volume
+        tickers = [t for t in tickers if t['symbol'].endswith(quote)]
+        
+        # Volumes arrive as strings; convert them in one batched map
+        volumes = map(float, map(itemgetter('quoteVolume'), tickers))
+        self.symbols = [
+            t['symbol'] for t, volume in zip(tickers, volumes)
+            if volume >= min_volume
+        ]
+        
+    def _load_cache(self):
+        """Restore klines and scan state saved by a previous run"""
         try:
-            if self._is_testnet:
-                # Generate test data
-                now = datetime.utcnow()
-                data = []
-                price = 100.0
+            if not os.path.exists(self.cache_path):
+                return
                 
-                for i in range(100):
-                    timestamp = now - timedelta(minutes=i)
-                    price = price * (1 + np.random.normal(0, 0.001))
-                    kline = {
-                        'timestamp': timestamp.timestamp() * 1000,
-                        'open': price * (1 + np.random.normal(0, 0.0001)),
-                        'high': price * (1 + np.random.normal(0, 0.0002)),
-                        'low': price * (1 + np.random.normal(0, 0.0002)),
-                        'close': price,
-                        'volume': np.random.normal(1000, 100)
-                    }
-                    data.append(kline)
-                    
-                return data
+            wanted = {
+                f"{symbol}_{interval}": (symbol, interval)
+                for symbol in self.symbols
+                for interval in self.timeframes
+            }
+            with np.load(self.cache_path) as data:
+                for name in data.files:
+                    if name in wanted:
+                        self._kline_cache[wanted[name]] = data[name]
+                        
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r') as f:
+                    for name, bucket in json.load(f).items():
+                        if name in wanted:
+                            self.last_scan[wanted[name]] = bucket
+                            
+            self.logger.info(f"Restored cached klines for {len(self._kline_cache)} pairs")
+            
+        except Exception as e:
+            self.logger.error(f"Error loading klines cache: {str(e)}")
+            self._kline_cache.clear()
+            self.last_scan.clear()
+            
+    async def _save_cache(self):
+        """Write klines and scan state to disk without blocking the event loop"""
+        arrays = {f"{symbol}_{interval}": klines for (symbol, interval), klines in self._kline_cache.items()}
+        state = {f"{symbol}_{interval}": bucket for (symbol, interval), bucket in self.last_scan.items()}
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._write_cache, arrays, state)
+        except Exception as e:
+            self.logger.error(f"Error saving klines cache: {str(e)}")
+            
+    def _write_cache(self, arrays: Dict[str, np.ndarray], state: Dict[str, int]):
+        """Write the cache files, replacing the previous ones atomically"""
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, self.cache_path)
+        
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        
+    def _on_kline(self, symbol: str, interval: str, row: tuple):
+        """Apply a kline push to the cached window"""
+        key = (symbol, interval)
+        cached = self._kline_cache.get(key)
+        if cached is None:
+            # Not seeded yet; the first REST fetch covers it
+            return
+            
+        last = int(cached['time'][-1])
+        if row[0] == last:
+            # Update of the candle still forming
+            klines = cached.copy()
+            klines[-1] = row
+        elif row[0] == last + self._interval_sec.get(interval, 60) * 1000:
+            klines = np.concatenate(
+                (cached, np.array([row], dtype=KLINE_DTYPE))
+            )[-self.kline_limit:]
+        elif row[0] > last:
+            # Missed candles while disconnected; reseed from REST
+            del self._kline_cache[key]
+            return
+        else:
+            return
+            
+        self._kline_cache[key] = klines
+        
+    async def _get_klines(self, symbol: str, interval: str) -> np.ndarray:
+        """Get klines/candlestick data as a KLINE_DTYPE array
+        
+        Errors are raised to the caller, which counts the failed pairs.
+        """
+        if self._is_testnet:
+            # Generate test data, one random draw per field
+            n = self.kline_limit
+            now_ms = time.time() * 1000
+            klines = np.empty(n, dtype=KLINE_DTYPE)
+            price = 100.0 * np.cumprod(1 + np.random.normal(0, 0.001, n))
+            
+            klines['time'] = now_ms - np.arange(n) * 60000
+            klines['open'] = price * (1 + np.random.normal(0, 0.0001, n))
+            klines['high'] = price * (1 + np.random.normal(0, 0.0002, n))
+            klines['low'] = price * (1 + np.random.normal(0, 0.0002, n))
+            klines['close'] = price
+            klines['volume'] = np.random.normal(1000, 100, n)
+            return klines
+            
+        else:
+            key = (symbol, interval)
+            cached = self._kline_cache.get(key)
+            
+            # A window restored from disk may be too old to extend
+            interval_ms = self._interval_sec.get(interval, 60) * 1000
+            if cached is not None and \
+                    time.time() * 1000 - cached['time'][-1] > self.kline_limit * interval_ms:
+                cached = None
                 
-            else:
+            if cached is not None and self._kline_stream and \
+                    self._kline_stream.is_live(symbol, interval):
+                # Kept current by the kline stream
+                return cached
+                
+            # Stay within the REST weight budget
+            if self._limiter is not None:
+                await self._limiter.acquire(self.klines_weight)
+                
+            if cached is None:
                 # Get real klines from Binance
-                klines = self.client.get_klines(
+                rows = await self.client.get_klines(
                     symbol=symbol,
                     interval=interval,
-                    limit=100
+                    limit=self.kline_limit
                 )
+                klines = _rows_to_klines(rows)
                 
-                return [
-                    {
-                        'timestamp': k[0],
-                        'open': float(k[1]),
-                        'high': float(k[2]),
-                        'low': float(k[3]),
-                        'close': float(k[4]),
-                        'volume': float(k[5])
-                    }
-                    for k in klines
-                ]
-
-        except Exception as e:
-            self.logger.error(f"Error getting klines for {symbol}: {str(e)}")
-            return []
+            else:
+                # The last cached candle was still open, so refetch from it
+                rows = await self.client.get_klines(
+                    symbol=symbol,
+                    interval=interval,
+                    startTime=int(cached['time'][-1]),
+                    limit=self.kline_limit
+                )
+                new = _rows_to_klines(rows)
+                if not len(new):
+                    return cached
+                klines = np.concatenate(
+                    (cached[cached['time'] < new['time'][0]], new)
+                )[-self.kline_limit:]
+                
+            self._kline_cache[key] = klines
+            return klines
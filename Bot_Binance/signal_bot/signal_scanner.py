@@ -7,30 +7,264 @@ Last Updated: 2025-05-24 10:05:29 UTC
 
 import os
 import sys
+import json
+import time
 import logging
 import asyncio
-from typing import Dict, List, Optional
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from binance.client import Client
 from shared.pair_manager import PairManager
 
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
 # Add project root to path for imports
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, PROJECT_ROOT)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-from signal_bot.signal_analyzer import SignalAnalyzer
-from shared.constants import Config, Interval, TradingMode
-from signal_bot.signal_bot import SignalBot
-from trade_manager.trade_manager import TradeManager
+from shared.binance_client import PooledAsyncClient
+from shared.kline_stream import KlineStream
+from shared.redis_cache import RedisCache
+from signal_bot.signal_analyzer import SignalAnalyzer, klines_to_array, parse_klines
+from shared.constants import Config, DatabaseConfig
+from signal_bot.signal_bot import INTERVAL_SECONDS
 class SignalScanner:
     def __init__(self, client, logger,pair_manager):
         self.client = client
         self.logger = logger
         self.telegram = None
+        self.max_message_length = 4096  # Telegram limit
+        
+        # Signals found during a scan cycle are sent once this many have
+        # collected, or once this many seconds passed since the last send
+        self.alert_batch_size = 5
+        self.alert_interval = 10
+        self.analyzer = SignalAnalyzer(logger=logger)
         self._is_testnet = getattr(client, 'testnet', False)
         self.pair_manager = pair_manager
+        
+        # Scan state
+        self.pairs: List[str] = []
+        self.last_scan: Dict[Tuple[str, str], float] = {}  # time.monotonic() of last scan
+        self._is_scanning = False
+        self._stop_event: Optional[asyncio.Event] = None
+        
+        # Seconds per scanned timeframe; an unknown timeframe is a
+        # configuration error, not something to guess a length for
+        unknown = [i for i in Config.TIMEFRAMES if i not in INTERVAL_SECONDS]
+        if unknown:
+            raise ValueError(f"Unsupported timeframes: {', '.join(unknown)}")
+        self._interval_seconds: Dict[str, int] = {
+            interval: INTERVAL_SECONDS[interval]
+            for interval in Config.TIMEFRAMES
+        }
+        
+        # Concurrent pair scans; the semaphore is created on first use
+        # so it binds to the running event loop
+        self.scan_concurrency = Config.SCAN_CONCURRENCY
+        self._sem: Optional[asyncio.Semaphore] = None
+        self.scan_burst = Config.SCAN_BURST
+        self._burst_used = 0
+        
+        # Threads for a blocking client passed in by the caller, sized so
+        # every concurrent scan, burst slots included, has one; the
+        # default executor is smaller
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        
+        # REST request weight budget shared by every concurrent scan
+        # (Binance allows 1200 per minute); the limiter is created on
+        # first use and requests are unthrottled without aiolimiter
+        self.weight_per_minute = 1200
+        self.request_weights = {
+            'get_klines': 2,
+            'get_ticker': 2,
+            'get_exchange_info': 20
+        }
+        self.all_tickers_weight = 80
+        self._limiter = None
+        
+        # Exchange info with the time.monotonic() it was fetched at; the
+        # symbol list changes a few times a day at most
+        self.exchange_info_ttl = 3600
+        self._exchange_info: Tuple[float, Optional[Dict]] = (0.0, None)
+        
+        # 24h quote volume per symbol, refreshed once per scan cycle; a
+        # snapshot younger than volume_ttl (e.g. the one _load_pairs just
+        # took) is reused
+        self.volume_ttl = 30
+        self._volumes: Dict[str, float] = {}
+        self._volumes_time = 0.0
+        
+        # Exchange info and tickers are also shared through Redis, when
+        # configured, so sibling processes and restarts reuse one fetch
+        self._shared_cache = RedisCache(logger=logger)
+        self._cache_scope = 'testnet' if self._is_testnet else 'live'
+        
+        # Latest klines per (symbol, interval) as (open time, open, high,
+        # low, close, volume) rows, seeded over REST and then kept current
+        # by the kline stream
+        self.kline_limit = 100
+        self.klines: Dict[Tuple[str, str], np.ndarray] = {}
+        self._kline_stream: Optional[KlineStream] = None
+        
+        # Set when initialize() created the client, so close() releases it
+        self._owns_client = False
+        
+        # Valid pairs from the last exchange scan, cached on disk
+        self._pairs_cache_path = os.path.join(PROJECT_ROOT, DatabaseConfig.PAIRS_CACHE_PATH)
+        
+    async def initialize(self):
+        """Create an async Binance client unless one was passed in"""
+        if self.client is None:
+            self.client = await PooledAsyncClient.create(
+                os.getenv('BINANCE_API_KEY'),
+                os.getenv('BINANCE_API_SECRET'),
+                testnet=self._is_testnet
+            )
+            self._owns_client = True
+            
+    async def close(self):
+        """Stop the kline stream and close the client created by initialize()"""
+        if self._kline_stream:
+            await self._kline_stream.stop()
+            self._kline_stream = None
+            
+        if self._owns_client and self.client:
+            await self.client.close_connection()
+            self.client = None
+            self._owns_client = False
+            
+        if self._io_pool:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+            
+        await self._shared_cache.close()
+            
+    async def _request(self, method: str, **kwargs):
+        """Call a Binance client method without blocking the event loop
+        
+        AsyncClient methods are awaited directly; a sync client passed in
+        by the caller runs on the scanner's I/O threads instead. Every
+        call first takes its weight from the shared limiter.
+        """
+        if self._limiter is None and AsyncLimiter is not None:
+            self._limiter = AsyncLimiter(self.weight_per_minute, 60)
+        if self._limiter is not None:
+            if method == 'get_ticker' and 'symbol' not in kwargs:
+                weight = self.all_tickers_weight
+            else:
+                weight = self.request_weights.get(method, 1)
+            await self._limiter.acquire(weight)
+            
+        func = getattr(self.client, method)
+        if asyncio.iscoroutinefunction(func):
+            return await func(**kwargs)
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=self.scan_concurrency + self.scan_burst,
+                thread_name_prefix='scanner-io'
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, partial(func, **kwargs))
+
+    def _read_pairs_cache(self) -> Optional[List[str]]:
+        """Return cached pairs if the cache is fresh and for this network"""
+        try:
+            if not os.path.exists(self._pairs_cache_path):
+                return None
+                
+            with open(self._pairs_cache_path, 'r') as f:
+                cache = json.load(f)
+                
+            if cache.get('testnet') != self._is_testnet:
+                return None
+            if time.time() - cache.get('ts', 0) > DatabaseConfig.PAIRS_CACHE_TTL:
+                return None
+            return cache['pairs']
+            
+        except Exception as e:
+            self.logger.error(f"Error reading pairs cache: {str(e)}")
+            return None
+            
+    def _write_pairs_cache(self, pairs: List[str]):
+        """Save pairs to the cache file, replacing it atomically"""
+        try:
+            os.makedirs(os.path.dirname(self._pairs_cache_path), exist_ok=True)
+            tmp_path = self._pairs_cache_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(
+                    {'ts': time.time(), 'testnet': self._is_testnet, 'pairs': pairs},
+                    f
+                )
+            os.replace(tmp_path, self._pairs_cache_path)
+            
+        except Exception as e:
+            self.logger.error(f"Error writing pairs cache: {str(e)}")
 
-    async def _load_pairs(self) -> List[str]:
+    async def _get_exchange_info(self) -> Dict:
+        """Exchange info, fetched again once the cached copy expires"""
+        fetched_at, info = self._exchange_info
+        now = time.monotonic()
+        if info is None or now - fetched_at >= self.exchange_info_ttl:
+            info = await self._shared_cache.get_or_set(
+                f"exchange_info:{self._cache_scope}",
+                self.exchange_info_ttl,
+                partial(self._request, 'get_exchange_info')
+            )
+            self._exchange_info = (now, info)
+        return info
+        
+    async def _get_tickers(self) -> List[Dict]:
+        """24h tickers of every symbol, shared for volume_ttl seconds"""
+        return await self._shared_cache.get_or_set(
+            f"tickers:{self._cache_scope}",
+            self.volume_ttl,
+            partial(self._request, 'get_ticker')
+        )
+        
+    async def update_pairs(self):
+        """Reload pairs from the exchange, bypassing the cache"""
+        self.pairs = await self._load_pairs(force=True)
+        if self._kline_stream:
+            await self._kline_stream.stop()
+            self._kline_stream = None
+            self._start_stream()
+            
+    def _start_stream(self):
+        """Subscribe to kline pushes for the current pairs"""
+        if self._is_testnet or not self.pairs:
+            return
+        self._kline_stream = KlineStream(self._on_kline, self.logger)
+        self._kline_stream.start(self.pairs, Config.TIMEFRAMES)
+        
+    def _on_kline(self, symbol: str, interval: str, row: tuple):
+        """Apply a kline push to the stored window"""
+        key = (symbol, interval)
+        window = self.klines.get(key)
+        if window is None:
+            # Not seeded yet; the first REST fetch covers it
+            return
+            
+        last = int(window[-1, 0])
+        if row[0] == last:
+            # Update of the candle still forming
+            window[-1] = row
+        elif row[0] == last + self._interval_seconds[interval] * 1000:
+            # New candle: shift the buffer in place
+            window[:-1] = window[1:]
+            window[-1] = row
+        elif row[0] > last:
+            # Missed candles while disconnected; reseed from REST
+            del self.klines[key]
+
+    async def _load_pairs(self, force: bool = False) -> List[str]:
         """Load valid trading pairs"""
         try:
             monitored_pairs = await self.pair_manager.get_pairs_to_scan()
@@ -38,36 +272,58 @@ class SignalScanner:
                 # Chỉ quét các cặp được chọn
                 self.logger.info(f"Scanning selected pairs: {monitored_pairs}")
                 return monitored_pairs
+                
+            if not force:
+                pairs = self._read_pairs_cache()
+                if pairs:
+                    self.logger.info(f"Loaded {len(pairs)} pairs from cache")
+                    return pairs
+                    
             # Get exchange info
-            exchange_info = self.client.get_exchange_info()
+            exchange_info = await self._get_exchange_info()
+            
+            # Symbols quoted in USDT, read from the exchange info field
+            # instead of matching name suffixes
+            quote = Config.QUOTE_ASSET
             
             # Get all USDT pairs if testnet
             if self._is_testnet:
                 pairs = [
                     symbol['symbol'] for symbol in exchange_info['symbols']
-                    if symbol['symbol'].endswith('USDT') and
+                    if symbol['quoteAsset'] == quote and
                     symbol['status'] == 'TRADING'
                 ]
                 self.logger.info(f"Found {len(pairs)} testnet trading pairs")
-                return pairs[:10]  # Limit to 10 pairs for testing
+                pairs = pairs[:10]  # Limit to 10 pairs for testing
+                self._write_pairs_cache(pairs)
+                return pairs
+            
+            # Production mode - check volume, with one 24h ticker
+            # request covering every symbol; the first scan reuses it
+            self._store_volumes(await self._get_tickers())
+            volumes = self._volumes
             
-            # Production mode - check volume
+            min_volume = Config.MIN_VOLUME
             valid_pairs = []
             for symbol in exchange_info['symbols']:
-                if not symbol['symbol'].endswith('USDT'):
+                if symbol['quoteAsset'] != quote:
                     continue
                     
                 # Check 24h volume
-                ticker = self.client.get_ticker(symbol=symbol['symbol'])
-                volume = float(ticker['quoteVolume'])
+                name = symbol['symbol']
+                volume = volumes.get(name)
+                if volume is None:
+                    continue
                 
-                if volume >= Config.MIN_VOLUME:
-                    valid_pairs.append(symbol['symbol'])
+                if volume >= min_volume:
+                    valid_pairs.append(name)
                     self.logger.info(
-                        f"Found valid pair: {symbol['symbol']} - "
+                        f"Found valid pair: {name} - "
                         f"Volume: ${volume:,.2f}"
                     )
             
+            if valid_pairs:
+                self._write_pairs_cache(valid_pairs)
             return valid_pairs
 
         except Exception as e:
@@ -81,263 +337,310 @@ class SignalScanner:
         symbol: str,
         interval: str,
         limit: int = 100
-    ) -> Optional[List]:
-        """Get klines data from Binance"""
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Get klines as field arrays, from the stream window when it is live"""
         try:
-            klines = self.client.get_klines(
+            key = (symbol, interval)
+            window = self.klines.get(key)
+            if (window is not None and len(window) >= limit and
+                    self._kline_stream and
+                    self._kline_stream.is_live(symbol, interval)):
+                return klines_to_array(window[-limit:])
+                
+            klines = await self._request(
+                'get_klines',
                 symbol=symbol,
                 interval=interval,
                 limit=limit
             )
-            return klines
+            if not klines:
+                return None
+                
+            # Parse the strings once for every reader
+            rows = parse_klines(klines)
+            if limit >= self.kline_limit:
+                # Seed the window the stream keeps current
+                self.klines[key] = rows[-self.kline_limit:].copy()
+            return klines_to_array(rows)
         except Exception as e:
             self.logger.error(
                 f"Error getting klines for {symbol}: {str(e)}"
             )
             return None
             
+    def _store_volumes(self, tickers: List[Dict]):
+        """Keep the 24h quote volumes of a ticker snapshot"""
+        # Binance sends volumes as strings; convert the whole column in
+        # one batched map instead of a float() call per dict entry
+        self._volumes = dict(zip(
+            map(itemgetter('symbol'), tickers),
+            map(float, map(itemgetter('quoteVolume'), tickers))
+        ))
+        self._volumes_time = time.monotonic()
+        
+    async def _refresh_volumes(self):
+        """Take a 24h volume snapshot of every symbol in one request"""
+        if time.monotonic() - self._volumes_time < self.volume_ttl:
+            return
+        try:
+            self._store_volumes(await self._get_tickers())
+        except Exception as e:
+            # Scans fall back to per-symbol ticker requests
+            self.logger.error(f"Error getting tickers: {str(e)}")
+            self._volumes = {}
+            
     async def _scan_pair(self, symbol: str, interval: str) -> Optional[Dict]:
         """Scan single pair for signals"""
+        # The step-by-step trace runs per pair and timeframe; only build
+        # its messages when INFO records are actually emitted
+        verbose = self.logger.isEnabledFor(logging.INFO)
         try:
-            self.logger.info(f"\nScanning {symbol} on {interval}...")
+            if verbose:
+                self.logger.info(f"\nScanning {symbol} on {interval}...")
             
-            # Step 1: Check Volume
-            ticker = self.client.get_ticker(symbol=symbol)
-            volume = float(ticker['quoteVolume'])
+            # Step 1: Check Volume, from this cycle's ticker snapshot
+            volume = self._volumes.get(symbol)
+            if volume is None:
+                ticker = await self._request('get_ticker', symbol=symbol)
+                volume = float(ticker['quoteVolume'])
+            min_volume = Config.MIN_VOLUME
             
-            self.logger.info(f"1. Volume Check for {symbol}:")
-            self.logger.info(f"   - 24h Volume: ${volume:,.2f}")
-            self.logger.info(f"   - Min Required: ${Config.MIN_VOLUME:,.2f}")
+            if verbose:
+                self.logger.info(f"1. Volume Check for {symbol}:")
+                self.logger.info(f"   - 24h Volume: ${volume:,.2f}")
+                self.logger.info(f"   - Min Required: ${min_volume:,.2f}")
             
-            if volume < Config.MIN_VOLUME:
-                self.logger.info(f"   ❌ {symbol} failed volume check")
+            if volume < min_volume:
+                if verbose:
+                    self.logger.info(f"   ❌ {symbol} failed volume check")
                 return None
-            self.logger.info(f"   ✅ {symbol} passed volume check")
+            if verbose:
+                self.logger.info(f"   ✅ {symbol} passed volume check")
 
             # Step 2: Get Klines
-            self.logger.info(f"2. Getting {interval} klines for {symbol}...")
+            if verbose:
+                self.logger.info(f"2. Getting {interval} klines for {symbol}...")
             klines = await self._get_klines(symbol, interval)
             if not klines:
-                self.logger.info(f"   ❌ {symbol} failed to get klines")
-                return None
-            self.logger.info(f"   ✅ Got {len(klines)} klines")
-
-            # Step 3: Volume Trend Check
-            self.logger.info(f"3. Checking volume trend for {symbol}:")
-            volumes = np.array([float(k[5]) for k in klines])
-            volume_ma = self._sma(volumes, Config.VOLUME_PERIOD)[-1]
-            volume_ratio = volumes[-1] / volume_ma if volume_ma > 0 else 0
-            
-            self.logger.info(f"   - Current Volume: ${volumes[-1]:,.2f}")
-            self.logger.info(f"   - Volume MA: ${volume_ma:,.2f}")
-            self.logger.info(f"   - Volume Ratio: {volume_ratio:.2f}")
-            self.logger.info(f"   - Required Ratio: {Config.VOLUME_RATIO_MIN}")
-            
-            if volume_ratio < Config.VOLUME_RATIO_MIN:
-                self.logger.info(f"   ❌ {symbol} failed volume trend check")
+                if verbose:
+                    self.logger.info(f"   ❌ {symbol} failed to get klines")
                 return None
-            self.logger.info(f"   ✅ {symbol} passed volume trend check")
+            if verbose:
+                self.logger.info(f"   ✅ Got {len(klines['close'])} klines")
 
-            # Step 4: Price Trend Check
-            self.logger.info(f"4. Checking price trend for {symbol}:")
-            closes = np.array([float(k[4]) for k in klines])
-            fast_ma = self._sma(closes, Config.FAST_MA)
-            slow_ma = self._sma(closes, Config.SLOW_MA)
-            
-            curr_fast = fast_ma[-1]
-            curr_slow = slow_ma[-1]
-            
-            self.logger.info(f"   - Current Price: ${closes[-1]:,.8f}")
-            self.logger.info(f"   - Fast MA: ${curr_fast:,.8f}")
-            self.logger.info(f"   - Slow MA: ${curr_slow:,.8f}")
-            
-            trend = None
-            if curr_fast > curr_slow:
-                if all(fast_ma[-5:] > slow_ma[-5:]):
-                    trend = "LONG"
-            elif curr_fast < curr_slow:
-                if all(fast_ma[-5:] < slow_ma[-5:]):
-                    trend = "SHORT"
-                    
-            if not trend:
-                self.logger.info(f"   ❌ {symbol} no clear trend")
+            # Step 3: Analyze
+            if verbose:
+                self.logger.info(f"3. Analyzing {symbol} on {interval}...")
+            result = await self.analyzer.analyze_klines(symbol, klines, interval)
+            if result is None:
+                if verbose:
+                    self.logger.info(f"   ❌ {symbol} no signal")
                 return None
-            self.logger.info(f"   ✅ {symbol} shows {trend} trend")
-
-            # Step 5: RSI Check
-            self.logger.info(f"5. Checking RSI for {symbol}:")
-            rsi = self._rsi(closes)[-1]
-            self.logger.info(f"   - Current RSI: {rsi:.2f}")
-            
-            if trend == "LONG" and rsi > 70:
-                self.logger.info(f"   ❌ {symbol} RSI overbought")
-                return None
-            elif trend == "SHORT" and rsi < 30:
-                self.logger.info(f"   ❌ {symbol} RSI oversold")
-                return None
-            self.logger.info(f"   ✅ {symbol} RSI in range")
-
-            # Step 6: Calculate Levels
-            self.logger.info(f"6. Calculating levels for {symbol}:")
-            entry = closes[-1]
-            upper, middle, lower = self._bollinger_bands(closes)
-            
-            if trend == "LONG":
-                stop_loss = lower[-1]
-                take_profit = entry + ((entry - stop_loss) * 2)
-            else:
-                stop_loss = upper[-1]
-                take_profit = entry - ((stop_loss - entry) * 2)
                 
-            risk = abs(entry - stop_loss)
-            reward = abs(take_profit - entry)
-            rr_ratio = reward / risk if risk > 0 else 0
-            
-            self.logger.info(f"   - Entry: ${entry:,.8f}")
-            self.logger.info(f"   - Stop Loss: ${stop_loss:,.8f}")
-            self.logger.info(f"   - Take Profit: ${take_profit:,.8f}")
-            self.logger.info(f"   - Risk/Reward: {rr_ratio:.2f}")
-            
-            if rr_ratio < 2:
-                self.logger.info(f"   ❌ {symbol} insufficient risk/reward")
-                return None
-            self.logger.info(f"   ✅ {symbol} levels valid")
-
-            # Step 7: Calculate Confidence
-            self.logger.info(f"7. Calculating confidence for {symbol}:")
-            confidence = self._calculate_confidence(
-                closes,
-                volumes,
-                trend
-            )
-            
-            self.logger.info(f"   - Confidence Score: {confidence}%")
-            self.logger.info(f"   - Minimum Required: {Config.MIN_CONFIDENCE}%")
-            
-            if confidence < Config.MIN_CONFIDENCE:
-                self.logger.info(f"   ❌ {symbol} confidence too low")
-                return None
-            self.logger.info(f"   ✅ {symbol} confidence sufficient")
-
             # Create Signal
-            signal = {
-                'symbol': symbol,
-                'type': trend,
-                'entry_price': entry,
-                'take_profit': take_profit,
-                'stop_loss': stop_loss,
-                'confidence': confidence,
-                'volume': volume,
-                'volume_ratio': volume_ratio,
-                'rsi': rsi,
-                'risk_reward': rr_ratio,
-                'time': int(datetime.utcnow().timestamp() * 1000)
-            }
+            signal = result.to_dict()
+            trend = signal['type']
+            entry = signal['entry_price']
+            take_profit = signal['take_profit']
+            stop_loss = signal['stop_loss']
+            confidence = signal['confidence']
+            risk = abs(entry - stop_loss)
+            rr_ratio = abs(take_profit - entry) / risk if risk > 0 else 0
+            signal['volume'] = volume
+            signal['risk_reward'] = rr_ratio
 
             # Log Success
-            self.logger.info(f"\n✨ Signal generated for {symbol}:")
-            self.logger.info(f"   Type: {trend}")
-            self.logger.info(f"   Entry: ${entry:,.8f}")
-            self.logger.info(f"   Take Profit: ${take_profit:,.8f}")
-            self.logger.info(f"   Stop Loss: ${stop_loss:,.8f}")
-            self.logger.info(f"   Confidence: {confidence}%")
-            self.logger.info(f"   Risk/Reward: {rr_ratio:.2f}")
-            
-            # Send detailed Telegram notification
-            if self.telegram:
-                await self.telegram.send_message(
-                    f"🎯 Signal Alert - {symbol}\n\n"
-                    f"Type: {trend}\n"
-                    f"Entry: ${entry:,.8f}\n"
-                    f"Take Profit: ${take_profit:,.8f}\n"
-                    f"Stop Loss: ${stop_loss:,.8f}\n\n"
-                    f"Confidence: {confidence}%\n"
-                    f"Risk/Reward: {rr_ratio:.2f}\n"
-                    f"RSI: {rsi:.2f}\n"
-                    f"Volume 24h: ${volume:,.2f}\n"
-                    f"Volume Ratio: {volume_ratio:.2f}x\n\n"
-                    f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
-                )
-
+            if verbose:
+                self.logger.info(f"\n✨ Signal generated for {symbol}:")
+                self.logger.info(f"   Type: {trend}")
+                self.logger.info(f"   Entry: ${entry:,.8f}")
+                self.logger.info(f"   Take Profit: ${take_profit:,.8f}")
+                self.logger.info(f"   Stop Loss: ${stop_loss:,.8f}")
+                self.logger.info(f"   Confidence: {confidence}%")
+                self.logger.info(f"   Risk/Reward: {rr_ratio:.2f}")
+            
             return signal
 
         except Exception as e:
             self.logger.error(f"Error scanning {symbol}: {str(e)}")
             return None
             
+    def _format_signal(self, signal: Dict) -> str:
+        """Detailed Telegram text for one signal"""
+        return (
+            f"🎯 Signal Alert - {signal['symbol']}\n\n"
+            f"Type: {signal['type']}\n"
+            f"Entry: ${signal['entry_price']:,.8f}\n"
+            f"Take Profit: ${signal['take_profit']:,.8f}\n"
+            f"Stop Loss: ${signal['stop_loss']:,.8f}\n\n"
+            f"Confidence: {signal['confidence']}%\n"
+            f"Risk/Reward: {signal['risk_reward']:.2f}\n"
+            f"RSI: {signal['rsi']:.2f}\n"
+            f"Volume 24h: ${signal['volume']:,.2f}\n"
+            f"Volume Ratio: {signal['volume_ratio']:.2f}x"
+        )
+        
+    async def _send_signals(self, signals: List[Dict]):
+        """Send one Telegram notification for a batch of signals"""
+        if not (self.telegram and signals):
+            return
+            
+        try:
+            footer = f"\n\nTime: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
+            message = ''
+            for signal in signals:
+                text = self._format_signal(signal)
+                if message and (
+                    len(message) + len(text) + len(footer) + 5 >
+                    self.max_message_length
+                ):
+                    await self.telegram.send_message(message + footer)
+                    message = ''
+                message = f"{message}\n---\n{text}" if message else text
+                
+            await self.telegram.send_message(message + footer)
+            
+        except Exception as e:
+            self.logger.error(f"Error sending signals: {str(e)}")
+            
+    async def _scan_bounded(self, symbol: str, interval: str) -> Optional[Dict]:
+        """Scan single pair, bounded by the scan semaphore
+        
+        While every slot is taken, up to scan_burst scans run on temporary
+        extra slots instead of queueing. The REST limiter still paces
+        their requests. Scans are not started first-in first-out: a burst
+        scan can start before earlier ones waiting on the semaphore.
+        """
+        if self._sem.locked() and self._burst_used < self.scan_burst:
+            self._burst_used += 1
+            try:
+                return await self._scan_pair(symbol, interval)
+            finally:
+                self._burst_used -= 1
+                
+        async with self._sem:
+            return await self._scan_pair(symbol, interval)
+            
+    async def _scan_tagged(self, symbol: str, interval: str) -> Tuple[str, str, object]:
+        """Bounded scan returning the pair with its signal or exception"""
+        try:
+            return symbol, interval, await self._scan_bounded(symbol, interval)
+        except Exception as e:
+            return symbol, interval, e
+            
     async def start_scanning(self):
         """Start scanning for signals"""
         try:
             self._is_scanning = True
+            self._stop_event = asyncio.Event()
+            await self.initialize()
             
             while self._is_scanning:
                 # Load/reload pairs
                 if not self.pairs:
                     self.pairs = await self._load_pairs()
+                    self._start_stream()
                     
                 if not self.pairs:
                     self.logger.error("No valid pairs to scan")
-                    await asyncio.sleep(60)
+                    await self._wait_for_stop(60)
                     continue
                     
-                # Scan each pair
-                for symbol in self.pairs:
-                    if not self._is_scanning:
-                        break
+                # Collect every pair whose timeframe is due in one pass;
+                # lookups are bound once per cycle
+                now = time.monotonic()
+                scanned = self.last_scan
+                seconds = self._interval_seconds
+                timeframes = list(seconds.items())
+                never = float('-inf')
+                due = [
+                    (symbol, interval)
+                    for symbol in self.pairs
+                    for interval, interval_seconds in timeframes
+                    if now - scanned.get((symbol, interval), never) >= interval_seconds
+                ]
+                
+                # Due pairs are next due one interval from now, the others
+                # one interval after their last scan
+                next_due = min(
+                    [now + 60] +
+                    [now + seconds[interval] for interval in {i for _, i in due}] +
+                    [
+                        last + seconds[interval]
+                        for (_, interval), last in scanned.items()
+                        if now - last < seconds.get(interval, 0)
+                    ]
+                )
                         
-                    # Check each timeframe
-                    for interval in Config.TIMEFRAMES:
-                        try:
-                            # Check if enough time passed since last scan
-                            last_scan = self.last_scan.get(
-                                f"{symbol}_{interval}",
-                                0
-                            )
-                            
-                            now = int(datetime.utcnow().timestamp())
-                            
-                            # Convert interval to seconds
-                            if interval.endswith('m'):
-                                interval_seconds = int(interval[:-1]) * 60
-                            elif interval.endswith('h'):
-                                interval_seconds = int(interval[:-1]) * 3600
-                            else:
-                                interval_seconds = 86400
-                                
-                            # Skip if scanned recently
-                            if now - last_scan < interval_seconds:
-                                continue
-                                
-                            # Scan pair
-                            signal = await self._scan_pair(
-                                symbol,
-                                interval
-                            )
-                            
-                            # Update last scan time
-                            self.last_scan[f"{symbol}_{interval}"] = now
-                            
-                            # Yield signal if found
-                            if signal:
-                                yield signal
-                                
-                            # Small delay between scans
-                            await asyncio.sleep(0.1)
-                            
-                        except Exception as e:
+                if due:
+                    await self._refresh_volumes()
+                    
+                # Scan due pairs concurrently, yielding each signal as
+                # soon as its scan finishes
+                if self._sem is None:
+                    self._sem = asyncio.Semaphore(self.scan_concurrency)
+                tasks = [
+                    asyncio.ensure_future(self._scan_tagged(symbol, interval))
+                    for symbol, interval in due
+                ]
+                found = []
+                sent_at = time.monotonic()
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        symbol, interval, signal = await next_done
+                        if isinstance(signal, Exception):
                             self.logger.error(
-                                f"Error scanning {symbol} on {interval}: {str(e)}"
+                                f"Error scanning {symbol} on {interval}: {str(signal)}"
                             )
                             continue
                             
-                # Delay between scan cycles
-                await asyncio.sleep(1)
+                        # Update last scan time
+                        self.last_scan[symbol, interval] = now
+                        
+                        # Yield signal if found
+                        if signal:
+                            found.append(signal)
+                            yield signal
+                            
+                        # Alert in small batches instead of after the
+                        # whole cycle, which can take minutes
+                        if found and (
+                            len(found) >= self.alert_batch_size or
+                            time.monotonic() - sent_at >= self.alert_interval
+                        ):
+                            await self._send_signals(found)
+                            found = []
+                            sent_at = time.monotonic()
+                            
+                        if not self._is_scanning:
+                            break
+                finally:
+                    # Scans still running when scanning stops are dropped
+                    for task in tasks:
+                        task.cancel()
+                        
+                    # Signals not sent yet, also when the consumer closes
+                    # the generator mid-cycle
+                    await self._send_signals(found)
+                    
+                # Sleep until the next pair is due; failed scans retry then
+                await self._wait_for_stop(max(next_due - time.monotonic(), 1))
                 
         except Exception as e:
             self.logger.error(f"Scanning error: {str(e)}")
         finally:
             self._is_scanning = False
+            await self.close()
+            
+    async def _wait_for_stop(self, timeout: float):
+        """Sleep for up to timeout seconds, waking early when scanning stops"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
             
     def stop_scanning(self):
         """Stop scanning for signals"""
-        self._is_scanning = False
\ No newline at end of file
+        self._is_scanning = False
+        if self._stop_event:
+            self._stop_event.set()
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Signal Analyzer Tests
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+import signal_bot.signal_analyzer as signal_analyzer
+from signal_bot.signal_analyzer import SignalAnalyzer
+
+WINDOW = 100
+
+def _series(seed: int, n: int) -> np.ndarray:
+    """Synthetic (n, 6) klines trending up or down with a volume spike"""
+    rng = np.random.default_rng(seed)
+    drift = 0.002 if seed % 2 else -0.002
+    closes = 100 * np.cumprod(1 + rng.normal(drift, 0.01, n))
+    volumes = rng.uniform(100, 200, n)
+    volumes[-6:] = np.linspace(300, 2000, 6)
+    times = np.arange(n) * 60000.
+    return np.column_stack([times, closes, closes * 1.01, closes * 0.99, closes, volumes])
+
+def _sma(data: np.ndarray, period: int) -> np.ndarray:
+    return np.convolve(data, np.ones(period)/period, mode='valid')
+
+def _rsi(closes: np.ndarray, period: int = 14) -> float:
+    """Last Wilder RSI value, computed the straightforward way"""
+    deltas = np.diff(closes)
+    seed = deltas[:period+1]
+    up = seed[seed >= 0].sum()/period
+    down = -seed[seed < 0].sum()/period
+    for delta in deltas[period-1:]:
+        up = (up*(period-1) + max(delta, 0.))/period
+        down = (down*(period-1) + max(-delta, 0.))/period
+    return 100. if down == 0 else 100. - 100./(1. + up/down)
+
+def _reference_signal(klines: np.ndarray):
+    """Signal fields from the per-indicator rules analyze_klines fuses"""
+    closes, volumes = klines[:, 4], klines[:, 5]
+    
+    volume_ratio = volumes[-1] / _sma(volumes, 20)[-1]
+    if volume_ratio < signal_analyzer._VOLUME_RATIO_MIN:
+        return None
+    if not (volumes[-5:] >= volumes[-6:-1]).all():
+        return None
+        
+    fast_ma, slow_ma = _sma(closes, 12), _sma(closes, 26)
+    if (fast_ma[-5:] > slow_ma[-5:]).all():
+        signal_type = 'LONG'
+    elif (fast_ma[-5:] < slow_ma[-5:]).all():
+        signal_type = 'SHORT'
+    else:
+        return None
+        
+    entry = closes[-1]
+    middle, std = _sma(closes, 20)[-1], np.std(closes[-20:])
+    if signal_type == 'LONG':
+        sl = middle - std * 2
+        tp = entry + (entry - sl) * 2
+    else:
+        sl = middle + std * 2
+        tp = entry - (sl - entry) * 2
+    if (entry - sl if signal_type == 'LONG' else sl - entry) <= 0:
+        return None
+        
+    rsi = _rsi(closes)
+    macd = fast_ma[-len(slow_ma):] - slow_ma
+    curr_macd, curr_signal = macd[-1], _sma(macd, 9)[-1]
+    confidence = round(
+        (30 if (curr_macd > curr_signal if signal_type == 'LONG'
+                else curr_macd < curr_signal) else 0)
+        + min(30, volume_ratio * 10)
+        + (20 if 30 < rsi < 70 else 0)
+        + (20 if curr_macd != curr_signal else 0),
+        2
+    )
+    return signal_type, confidence, entry, tp, sl, round(rsi, 2), round(volume_ratio, 2)
+
+@pytest.fixture
+def no_confidence_floor(monkeypatch):
+    """Let every candidate through so low scores are compared too"""
+    monkeypatch.setattr(signal_analyzer, '_MIN_CONFIDENCE', 0)
+
+def test_analyze_klines_matches_reference_rules(no_confidence_floor):
+    analyzer = SignalAnalyzer()
+    compared = 0
+    for seed in range(400):
+        klines = _series(seed, WINDOW)
+        signal = asyncio.run(analyzer.analyze_klines(f"S{seed}", klines))
+        expected = _reference_signal(klines)
+        assert (signal is None) == (expected is None), seed
+        if signal is None:
+            continue
+        compared += 1
+        assert signal.type == expected[0]
+        assert signal.confidence == pytest.approx(expected[1], abs=0.011)
+        assert (signal.entry_price, signal.take_profit, signal.stop_loss) == \
+            pytest.approx(expected[2:5], rel=1e-8)
+        assert signal.rsi == pytest.approx(expected[5], abs=0.011)
+        assert signal.volume_ratio == pytest.approx(expected[6], abs=0.011)
+    assert compared > 100
+
+def test_incremental_state_matches_fresh_window(no_confidence_floor):
+    klines = _series(7, 3000)
+    # Volumes rising over every 10 candles, so most windows reach scoring
+    klines[:, 5] = 100 * 1.3 ** (np.arange(len(klines)) % 10)
+    key = ('X', '1m')
+    analyzer = SignalAnalyzer()
+    for end in range(WINDOW, len(klines)):
+        window = klines[end - WINDOW:end]
+        fresh = SignalAnalyzer()
+        
+        signal = asyncio.run(analyzer.analyze_klines('X', window, '1m'))
+        expected = asyncio.run(fresh.analyze_klines('X', window, '1m'))
+        assert (signal is None) == (expected is None), end
+        if signal is not None:
+            # RSI is reseeded from the window, so it matches exactly
+            assert signal.rsi == expected.rsi
+            assert signal.confidence == expected.confidence
+            
+        times, closes, volumes = window[:, 0], window[:, 4], window[:, 5]
+        state = analyzer._state[key]
+        seeded = fresh._state[key]
+        assert state.time == seeded.time
+        assert state.volume_sum == pytest.approx(seeded.volume_sum, rel=1e-12)
+        for got, want in zip(
+            state.moving_averages(closes[-1]), seeded.moving_averages(closes[-1])
+        ):
+            np.testing.assert_allclose(got, want, rtol=1e-12)
+            
+        # Both also agree with the averages computed over the window
+        fast_ma, slow_ma = state.moving_averages(closes[-1])
+        np.testing.assert_allclose(fast_ma, _sma(closes, 12)[-9:], rtol=1e-12)
+        np.testing.assert_allclose(slow_ma, _sma(closes, 26)[-9:], rtol=1e-12)
+        assert state.volume_ratio(volumes[-1]) == pytest.approx(
+            volumes[-1] / volumes[-20:].mean(), rel=1e-12
+        )
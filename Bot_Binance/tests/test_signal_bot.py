@@ -0,0 +1,293 @@
+"""
+Signal Bot Tests
+Author: Anhbaza01
+Version: 1.0.0
+Last Updated: 2026-10-16 08:00:00 UTC
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from signal_bot.signal_bot import (
+    KLINE_DTYPE, SignalBot, SignalGenerator, TechnicalAnalyzer,
+    _all_indicators, _as_prices
+)
+
+WINDOW = 100
+
+def _klines(seed: int, n: int = WINDOW) -> np.ndarray:
+    """Synthetic klines: a trend, a weak pullback and a sharp last candle
+    
+    Odd seeds fall then spike down (BUY candidates), even seeds rise then
+    spike up (SELL candidates); the noise decides which ones pass.
+    """
+    rng = np.random.default_rng(seed)
+    side = 1 if seed % 2 else -1
+    returns = rng.normal(0, 0.002, n)
+    returns[-40:-12] -= side * 0.006
+    returns[-12:-1] += side * 0.001
+    returns[-1] -= side * rng.uniform(0.005, 0.03)
+    price = 100 * np.cumprod(1 + returns)
+    
+    klines = np.empty(n, dtype=KLINE_DTYPE)
+    klines['time'] = np.arange(n) * 60000
+    for name in ('open', 'high', 'low', 'close'):
+        klines[name] = price
+    klines['volume'] = rng.uniform(100, 200, n)
+    klines['volume'][-1] = rng.uniform(200, 800)
+    return klines
+
+def _assert_same_signal(batch: dict, single: dict):
+    assert batch['type'] == single['type']
+    assert batch['reason'] == single['reason']
+    for key in ('price', 'volume', 'volume_ratio', 'strength'):
+        assert batch[key] == pytest.approx(single[key], rel=1e-5)
+    for key, value in single['indicators'].items():
+        assert batch['indicators'][key] == pytest.approx(value, rel=1e-4, abs=1e-6)
+
+def test_generate_signals_batch_matches_generate_signal():
+    generator = SignalGenerator(logging.getLogger(__name__))
+    klines_by_symbol = {f"S{i}": _klines(i) for i in range(600)}
+    # A window of another length goes through the per-symbol fallback
+    klines_by_symbol['SHORT'] = _klines(1, WINDOW - 10)
+    
+    batch = generator.generate_signals_batch(klines_by_symbol)
+    single = {
+        symbol: generator.generate_signal(symbol, klines)
+        for symbol, klines in klines_by_symbol.items()
+    }
+    single = {symbol: signal for symbol, signal in single.items() if signal}
+    
+    assert {s['type'] for s in single.values()} == {'BUY', 'SELL'}
+    assert batch.keys() == single.keys()
+    for symbol, signal in single.items():
+        _assert_same_signal(batch[symbol], signal)
+
+# Shortest window each _all_indicators output needs, in return order
+INDICATOR_PERIODS = (15, 26, 26, 26, 20, 20, 20, 50, 21, 1)
+
+def _separate_indicators(closes: np.ndarray, volumes: np.ndarray) -> tuple:
+    """The _all_indicators outputs from the TechnicalAnalyzer functions"""
+    ta = TechnicalAnalyzer
+    macd, signal, hist = ta.calculate_macd(closes)
+    upper, middle, lower = ta.calculate_bb(closes)
+    return (ta.calculate_rsi(closes), macd, signal, hist, upper, middle, lower,
+            ta.calculate_sma(closes, 50), ta.calculate_ema(closes, 21),
+            float(np.mean(volumes)))
+
+@pytest.mark.parametrize('n', [1, 2, 14, 15, 19, 20, 21, 25, 26, 49, 50, 51, 100, 500])
+def test_all_indicators_matches_technical_analyzer(n):
+    klines = _klines(n, max(n, 2))[-n:]
+    closes = _as_prices(klines['close'])
+    volumes = _as_prices(klines['volume'])
+    
+    fused = _all_indicators(closes, volumes)
+    separate = _separate_indicators(closes, volumes)
+    
+    for value, expected, period in zip(fused, separate, INDICATOR_PERIODS):
+        if n < period:
+            assert np.isnan(value) and np.isnan(expected)
+        else:
+            assert value == pytest.approx(expected, rel=1e-6, abs=1e-9)
+
+class FakeClient:
+    """Binance client serving _klines rows; symbols in fail raise"""
+    
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.closed = False
+        
+    async def get_klines(self, symbol, interval, limit, startTime=None):
+        await asyncio.sleep(0)
+        if symbol in self.fail:
+            raise ConnectionError(f"{symbol} unavailable")
+        klines = _klines(int(symbol[1:]), limit)
+        return [list(row) for row in klines.tolist()]
+        
+    async def close_connection(self):
+        self.closed = True
+
+class FakeTelegram:
+    """Records messages, taking delay seconds to send each"""
+    
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.messages = []
+        
+    async def send_message(self, text):
+        await asyncio.sleep(self.delay)
+        self.messages.append(text)
+
+def _start_bot(client, tmp_path, telegram=None) -> SignalBot:
+    """SignalBot with what initialize() sets up, minus the network"""
+    bot = SignalBot(None, logging.getLogger(__name__), None)
+    bot._is_testnet = False
+    bot.client = client
+    bot.telegram = telegram
+    bot.min_strength = 0
+    bot.cache_path = str(tmp_path / 'klines.npz')
+    bot.state_path = str(tmp_path / 'state.json')
+    bot.signal_generator = SignalGenerator(bot.logger)
+    bot._ta_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='indicators')
+    bot._sem = asyncio.Semaphore(bot.scan_concurrency)
+    bot._stop_event = asyncio.Event()
+    bot._out_q = asyncio.Queue(maxsize=bot.queue_size)
+    bot._sender_task = asyncio.create_task(bot._sender_loop())
+    return bot
+
+def _signal_items(count: int) -> list:
+    """First count (symbol, interval, signal) items with a signal"""
+    generator = SignalGenerator(logging.getLogger(__name__))
+    items = []
+    for i in range(100):
+        signal = generator.generate_signal(f"S{i}", _klines(i))
+        if signal:
+            items.append((f"S{i}", '1m', signal))
+            if len(items) == count:
+                break
+    return items
+
+def _expected_signals(symbols) -> dict:
+    generator = SignalGenerator(logging.getLogger(__name__))
+    signals = {}
+    for symbol in symbols:
+        signal = generator.generate_signal(symbol, _klines(int(symbol[1:])))
+        if signal:
+            signals[symbol] = signal['type']
+    return signals
+
+def test_analyze_batch_runs_on_indicator_pool(tmp_path):
+    symbols = [f"S{i}" for i in range(40)]
+    
+    async def scenario():
+        bot = _start_bot(FakeClient(), tmp_path)
+        threads = []
+        generate = bot.signal_generator.generate_signals_batch
+        
+        def record(klines_by_symbol):
+            threads.append(threading.current_thread().name)
+            return generate(klines_by_symbol)
+            
+        bot.signal_generator.generate_signals_batch = record
+        klines = {symbol: _klines(int(symbol[1:])) for symbol in symbols}
+        pending = []
+        await bot._analyze_batch({'1m': klines, '5m': klines}, pending)
+        await bot.stop()
+        return threads, pending
+        
+    threads, pending = asyncio.run(scenario())
+    
+    assert len(threads) == 2
+    assert all(name.startswith('indicators') for name in threads)
+    expected = _expected_signals(symbols)
+    for interval in ('1m', '5m'):
+        found = {s: sig['type'] for s, i, sig in pending if i == interval}
+        assert found == expected
+
+def test_scan_pipeline_keeps_batch_order_and_counts_failures(tmp_path):
+    symbols = [f"S{i}" for i in range(30)]
+    bad = {'S3', 'S17'}
+    due = [(symbol, '1m') for symbol in symbols]
+    
+    async def scenario():
+        bot = _start_bot(FakeClient(fail=bad), tmp_path)
+        bot.scan_batch_size = 4
+        bot.pipeline_depth = 2
+        events = []
+        fetch_batch, analyze_batch = bot._fetch_batch, bot._analyze_batch
+        
+        async def fetch(batch, buckets):
+            events.append(('fetch', batch[0][0]))
+            return await fetch_batch(batch, buckets)
+            
+        async def analyze(klines_by_interval, pending):
+            first = min(klines_by_interval['1m'], key=lambda s: int(s[1:]))
+            events.append(('analyze', first))
+            await asyncio.sleep(0.01)
+            await analyze_batch(klines_by_interval, pending)
+            events.append(('analyzed', first))
+            
+        bot._fetch_batch, bot._analyze_batch = fetch, analyze
+        pending = []
+        failed = await bot._scan_pipeline(due, {'1m': 60}, pending)
+        await bot.stop()
+        return bot, events, failed, pending
+        
+    bot, events, failed, pending = asyncio.run(scenario())
+    
+    assert failed == len(bad)
+    assert {s for s, i in bot.last_scan} == set(symbols) - bad
+    
+    # Batches are analyzed in fetch order, each after its own fetch
+    fetched = [name for event, name in events if event == 'fetch']
+    analyzed = [name for event, name in events if event == 'analyze']
+    assert fetched == [symbols[i] for i in range(0, len(symbols), 4)]
+    assert analyzed == fetched
+    for name in fetched:
+        assert events.index(('fetch', name)) < events.index(('analyze', name))
+        
+    # The next batch is fetched while the previous one is analyzed
+    assert events.index(('fetch', fetched[1])) < events.index(('analyzed', fetched[0]))
+    
+    expected = _expected_signals(set(symbols) - bad)
+    assert {s: sig['type'] for s, i, sig in pending} == expected
+
+def test_sender_loop_sends_single_and_batched_signals(tmp_path):
+    signals = _signal_items(3)
+    
+    async def scenario():
+        telegram = FakeTelegram()
+        bot = _start_bot(FakeClient(), tmp_path, telegram)
+        await bot._queue_signals(signals[:1])
+        await bot._queue_signals(signals)
+        await bot._out_q.join()
+        await bot.stop()
+        return telegram.messages
+        
+    messages = asyncio.run(scenario())
+    
+    assert messages[0].startswith('Trading Signal\n')
+    assert messages[1].startswith(f"Trading Signals ({len(signals)})")
+    for symbol, interval, signal in signals:
+        assert f"{signal['type']} {symbol} ({interval})" in messages[1]
+
+def test_stop_drains_queued_signals(tmp_path):
+    item = _signal_items(1)[0]
+    
+    async def scenario():
+        telegram = FakeTelegram(delay=0.01)
+        bot = _start_bot(FakeClient(), tmp_path, telegram)
+        for _ in range(5):
+            await bot._queue_signals([item])
+        await bot.stop()
+        return bot, telegram.messages
+        
+    bot, messages = asyncio.run(scenario())
+    
+    assert sum(m.startswith('Trading Signal\n') for m in messages) == 5
+    assert messages[-1].startswith('Signal Bot Stopping')
+    assert bot._out_q.empty()
+    assert bot._sender_task is None and bot._ta_pool is None and bot.client is None
+
+def test_stop_event_ends_the_wait_between_cycles(tmp_path):
+    async def scenario():
+        bot = _start_bot(FakeClient(), tmp_path)
+        bot.symbols = ['S1', 'S2']
+        bot.timeframes = ['1m']
+        bot._interval_sec = {'1m': 3600}
+        run = asyncio.create_task(bot.run())
+        while not bot._cycles:
+            await asyncio.sleep(0.01)
+            
+        started = time.monotonic()
+        await bot.stop()
+        await asyncio.wait_for(run, timeout=5)
+        return time.monotonic() - started
+        
+    assert asyncio.run(scenario()) < 5
@@ -474,12 +474,18 @@ class TradeManager:
         portfolio_value = sum(t.amount * t.current_price for t in self.active_trades)
         exposure = sum(t.amount * t.entry_price for t in self.active_trades)
         
+        # One account request serves both margin figures
+        try:
+            account = self.client.get_account()
+        except:
+            account = {}  # Both figures fall back to 0
+            
         metrics = {
             'portfolio_value': portfolio_value,
             'total_exposure': exposure,
             'exposure_ratio': (exposure / portfolio_value * 100) if portfolio_value > 0 else 0,
-            'free_margin': self._calculate_free_margin(),
-            'margin_level': self._calculate_margin_level(),
+            'free_margin': self._calculate_free_margin(account),
+            'margin_level': self._calculate_margin_level(account),
             'risk_per_trade': self.risk_per_trade * 100,
             'max_drawdown': self._calculate_drawdown(),
             'var_95': self._calculate_var(),
@@ -487,18 +493,20 @@ class TradeManager:
         }
         return metrics
 
-    def _calculate_free_margin(self) -> float:
-        """Calculate free margin"""
+    def _calculate_free_margin(self, account: Optional[Dict] = None) -> float:
+        """Calculate free margin, fetching the account unless given"""
         try:
-            account = self.client.get_account()
+            if account is None:
+                account = self.client.get_account()
             return float(account['availableBalance'])
         except:
             return 0.0
 
-    def _calculate_margin_level(self) -> float:
-        """Calculate margin level"""
+    def _calculate_margin_level(self, account: Optional[Dict] = None) -> float:
+        """Calculate margin level, fetching the account unless given"""
         try:
-            account = self.client.get_account()
+            if account is None:
+                account = self.client.get_account()
             total_margin = float(account['totalMarginBalance'])
             used_margin = float(account['totalMaintMargin'])
             return (total_margin / used_margin * 100) if used_margin > 0 else 0